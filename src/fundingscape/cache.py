@@ -2,22 +2,96 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
 import logging
+import mmap
 import os
+import struct
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import httpx
+import msgspec
+import orjson
+import zstandard
 
 from fundingscape import CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_DELAY = 1.0  # seconds between requests (be a good citizen)
+MEM_CACHE_MAX_BODY = 8 * 1024 * 1024  # larger bodies are only cached on disk
+MEM_CACHE_BYTES = 64 * 1024 * 1024  # default total body budget of the LRU layer
+
+T = TypeVar("T")
+
+# Cache file layout: magic, little-endian meta length, JSON meta, raw body.
+_CACHE_MAGIC = b"MG01"
+_HEADER = struct.Struct("<4sI")
+MMAP_MIN_BODY = 64 * 1024  # smaller cached bodies are read into bytes
+COMPRESS_MIN_BODY = 4096  # smaller bodies are stored raw
+_COMPRESS_SAMPLE = 256 * 1024  # larger bodies are probed with a leading sample
+_CHUNK_SIZE = 64 * 1024
+_BUF_SIZE = 1 << 20  # read buffer capacity kept between fetches
+_BUF_KEEP_MAX = 4 * _BUF_SIZE  # bodies above this do not use the shared buffer
+
+# Response headers kept on cache entries; the rest (CORS, security, cookies)
+# is never read back and only bloats the metadata.
+_PRESERVED_HEADERS = frozenset({"content-type", "etag", "last-modified", "content-length"})
+_ZSTD_LEVEL = 3
+
+# Archives are already compressed; zstd would only burn CPU to be discarded
+_PRECOMPRESSED_TYPES = frozenset({
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-tar",
+    "application/octet-stream",
+})
+
+# zstd contexts are not thread-safe; fetch_many writes from worker threads.
+_zstd_local = threading.local()
+
+
+def _compress(body: bytes | memoryview) -> bytes:
+    """zstd-compress a cache body with this thread's compressor."""
+    cctx = getattr(_zstd_local, "cctx", None)
+    if cctx is None:
+        cctx = _zstd_local.cctx = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+    return cctx.compress(body)
+
+
+def _worth_compressing(body: bytes | memoryview, content_type: str | None) -> bool:
+    """Whether zstd is likely to shrink `body`.
+
+    Archive content types are skipped outright. Bodies above the sample size
+    must first compress well over a leading sample, so an unlabelled archive
+    is not compressed in full only to be stored raw.
+    """
+    if len(body) < COMPRESS_MIN_BODY:
+        return False
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in _PRECOMPRESSED_TYPES:
+        return False
+    if len(body) > _COMPRESS_SAMPLE:
+        sample = memoryview(body)[:_COMPRESS_SAMPLE]
+        return len(_compress(sample)) < _COMPRESS_SAMPLE * 9 // 10
+    return True
+
+
+def _decompress(data: bytes) -> bytes:
+    """Inverse of _compress()."""
+    dctx = getattr(_zstd_local, "dctx", None)
+    if dctx is None:
+        dctx = _zstd_local.dctx = zstandard.ZstdDecompressor()
+    return dctx.decompress(data)
 
 
 @dataclass
@@ -25,41 +99,177 @@ class CacheEntry:
     url: str
     status_code: int
     headers: dict[str, str]
-    body: bytes
+    body: bytes | memoryview
     fetched_at: float
     etag: str | None = None
     last_modified: str | None = None
     was_cached: bool = False
+    _mmap: mmap.mmap | None = field(default=None, repr=False, compare=False)
+
+    def close(self) -> None:
+        """Release a memory-mapped body. The entry must not be used afterwards."""
+        if self._mmap is not None:
+            if isinstance(self.body, memoryview):
+                self.body.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> CacheEntry:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _replace_file(path: Path, *chunks: bytes | memoryview) -> None:
+    """Write a file via a temp file and rename.
+
+    Cached bodies may be memory-mapped by live entries; truncating the file
+    in place would fault those mappings, so files are always replaced.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+class HostThrottle:
+    """Per-host politeness delay for concurrent fetches."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last: dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        """Sleep until `delay` has passed since the last request to `host`."""
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last.get(host, float("-inf"))
+            if elapsed < self.delay:
+                await asyncio.sleep(self.delay - elapsed)
+            self._last[host] = time.monotonic()
 
 
 @dataclass
 class CachedHttpClient:
-    """HTTP client with filesystem caching and rate limiting."""
+    """HTTP client with filesystem caching and rate limiting.
+
+    With `write_batch` > 0, cache writes are buffered and flushed in
+    parallel once that many are pending (and on flush()/close()).
+    With `prefer_head`, cached entries are revalidated with a HEAD request
+    first, so unchanged bodies are never downloaded even by servers that
+    ignore conditional GETs.
+    """
 
     cache_dir: str = CACHE_DIR
     delay: float = DEFAULT_DELAY
     timeout: float = 60.0
+    mem_cache_size: int = 256
+    mem_cache_bytes: int = MEM_CACHE_BYTES
+    write_batch: int = 0
+    prefer_head: bool = False
     _last_request_time: float = field(default=0.0, repr=False)
+    _decoders: dict[type, Any] = field(default_factory=dict, repr=False)
+    _client: httpx.Client | None = field(default=None, repr=False)
+    _buf: bytearray = field(default_factory=lambda: bytearray(_BUF_SIZE), repr=False)
+    _dir: Path = field(init=False, repr=False)
+    _mem_cache: OrderedDict[str, CacheEntry] = field(
+        default_factory=OrderedDict, repr=False,
+    )
+    _mem_bytes: int = field(default=0, repr=False)
+    _mem_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _pending_writes: dict[Path, bytes] = field(default_factory=dict, repr=False)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        self._dir = Path(self.cache_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        # One pooled client per instance: keep-alive and HTTP/2 amortize the
+        # TLS handshake across fetches, which dominates small 304 responses.
+        self._client = httpx.Client(
+            http2=True,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+
+    def close(self) -> None:
+        """Flush batched cache writes and close the connection pool."""
+        self.flush()
+        if self._client is not None:
+            self._client.close()
+
+    def __enter__(self) -> CachedHttpClient:
+        return self
 
-    def _cache_path(self, url: str, suffix: str = "") -> Path:
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _url_hash(url: str) -> str:
+        """Memoized cache key for a URL (truncated SHA-256, hardware accelerated)."""
+        return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+    def _cache_path(self, url: str, suffix: str = ".cache") -> Path:
         """Generate cache file path from URL hash."""
-        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
-        source_dir = Path(self.cache_dir)
-        source_dir.mkdir(parents=True, exist_ok=True)
-        return source_dir / f"{url_hash}{suffix}"
+        return self._dir / f"{self._url_hash(url)}{suffix}"
 
     def _read_metadata(self, url: str) -> dict[str, Any] | None:
-        """Read cached metadata for a URL."""
-        meta_path = self._cache_path(url, ".meta.json")
-        if meta_path.exists():
-            return json.loads(meta_path.read_text())
-        return None
+        """Read cached metadata for a URL from the cache file header."""
+        path = self._cache_path(url)
+        if not path.exists():
+            return self._read_legacy_metadata(url)
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, meta_len = _HEADER.unpack(header)
+            if magic != _CACHE_MAGIC:
+                return None
+            return orjson.loads(f.read(meta_len))
+
+    def _remember(self, url: str, entry: CacheEntry) -> None:
+        """Keep an entry in the in-process LRU layer.
+
+        The layer is bounded both by entry count and by total body bytes;
+        least recently used entries are evicted until both limits hold.
+        """
+        size = len(entry.body)
+        if (self.mem_cache_size <= 0 or entry._mmap is not None
+                or size > min(MEM_CACHE_MAX_BODY, self.mem_cache_bytes)):
+            # Mapped bodies stay out: the page cache already holds them, and
+            # sharing them would let one caller's close() break another's.
+            return
+        if not entry.was_cached:
+            entry = replace(entry, was_cached=True)
+        with self._mem_lock:
+            old = self._mem_cache.pop(url, None)
+            if old is not None:
+                self._mem_bytes -= len(old.body)
+            self._mem_cache[url] = entry
+            self._mem_bytes += size
+            while (len(self._mem_cache) > self.mem_cache_size
+                   or self._mem_bytes > self.mem_cache_bytes):
+                _, evicted = self._mem_cache.popitem(last=False)
+                self._mem_bytes -= len(evicted.body)
+
+    def _lookup(self, url: str) -> CacheEntry | None:
+        """Return a cached entry from memory, falling back to disk."""
+        with self._mem_lock:
+            entry = self._mem_cache.get(url)
+            if entry is not None:
+                self._mem_cache.move_to_end(url)
+                return entry
+        entry = self._read_cache(url)
+        if entry is not None:
+            self._remember(url, entry)
+        return entry
 
     def _write_cache(self, url: str, entry: CacheEntry) -> None:
-        """Write response to cache."""
-        data_path = self._cache_path(url, ".data")
-        meta_path = self._cache_path(url, ".meta.json")
-        data_path.write_bytes(entry.body)
+        """Write response to cache as a single header + body file."""
         meta = {
             "url": url,
             "status_code": entry.status_code,
@@ -68,25 +278,93 @@ class CachedHttpClient:
             "etag": entry.etag,
             "last_modified": entry.last_modified,
         }
-        meta_path.write_text(json.dumps(meta, indent=2))
+        body = entry.body
+        if _worth_compressing(body, entry.headers.get("content-type")):
+            compressed = _compress(body)
+            if len(compressed) < len(body):
+                meta["encoding"] = "zstd"
+                body = compressed
+        meta_bytes = orjson.dumps(meta)
+        path = self._cache_path(url)
+        header = _HEADER.pack(_CACHE_MAGIC, len(meta_bytes))
+        if self.write_batch > 0:
+            with self._write_lock:
+                self._pending_writes[path] = b"".join((header, meta_bytes, body))
+                full = len(self._pending_writes) >= self.write_batch
+            if full:
+                self.flush()
+        else:
+            _replace_file(path, header, meta_bytes, body)
+        self._remember(url, entry)
+
+    def flush(self) -> None:
+        """Write out any batched cache entries."""
+        with self._write_lock:
+            pending, self._pending_writes = self._pending_writes, {}
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(_replace_file, pending.keys(), pending.values()))
+        logger.debug("Flushed %d cache entries", len(pending))
 
     def _read_cache(self, url: str) -> CacheEntry | None:
         """Read response from cache."""
+        path = self._cache_path(url)
+        if path in self._pending_writes:
+            self.flush()
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < _HEADER.size:
+                    return None
+                magic, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _CACHE_MAGIC:
+                    return None
+                meta = orjson.loads(f.read(meta_len))
+                offset = _HEADER.size + meta_len
+                if meta.get("encoding") == "zstd":
+                    return self._entry_from_meta(url, meta, _decompress(f.read()))
+                if size - offset < MMAP_MIN_BODY:
+                    return self._entry_from_meta(url, meta, f.read())
+                # Large body: hand out a zero-copy view of the page cache.
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return self._read_legacy_cache(url)
+        entry = self._entry_from_meta(url, meta, memoryview(mm)[offset:])
+        entry._mmap = mm
+        return entry
+
+    def _read_legacy_metadata(self, url: str) -> dict[str, Any] | None:
+        """Read metadata written by the older two-file (.data + .meta.json) layout."""
+        meta_path = self._cache_path(url, ".meta.json")
+        if meta_path.exists():
+            return orjson.loads(meta_path.read_bytes())
+        return None
+
+    def _read_legacy_cache(self, url: str) -> CacheEntry | None:
+        """Read an entry written by the older two-file layout, if present."""
         data_path = self._cache_path(url, ".data")
-        meta = self._read_metadata(url)
+        meta = self._read_legacy_metadata(url)
         if meta and data_path.exists():
-            return CacheEntry(
-                url=url,
-                status_code=meta["status_code"],
-                headers=meta["headers"],
-                body=data_path.read_bytes(),
-                fetched_at=meta["fetched_at"],
-                etag=meta.get("etag"),
-                last_modified=meta.get("last_modified"),
-                was_cached=True,
-            )
+            return self._entry_from_meta(url, meta, data_path.read_bytes())
         return None
 
+    @staticmethod
+    def _entry_from_meta(
+        url: str, meta: dict[str, Any], body: bytes | memoryview,
+    ) -> CacheEntry:
+        """Rebuild a cached CacheEntry from stored metadata and body."""
+        return CacheEntry(
+            url=url,
+            status_code=meta["status_code"],
+            headers=meta["headers"],
+            body=body,
+            fetched_at=meta["fetched_at"],
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            was_cached=True,
+        )
+
     def _rate_limit(self) -> None:
         """Enforce rate limiting between requests."""
         elapsed = time.time() - self._last_request_time
@@ -106,20 +384,15 @@ class CachedHttpClient:
         If cached and not modified (304), returns cached data.
         """
         if not force:
-            cached = self._read_cache(url)
+            cached = self._lookup(url)
+            if cached and self.prefer_head and self._unchanged_by_head(cached, headers):
+                return cached
             if cached:
                 # Try conditional request
-                req_headers = dict(headers or {})
-                if cached.etag:
-                    req_headers["If-None-Match"] = cached.etag
-                if cached.last_modified:
-                    req_headers["If-Modified-Since"] = cached.last_modified
-
                 self._rate_limit()
                 try:
-                    resp = httpx.get(
-                        url, headers=req_headers, timeout=self.timeout,
-                        follow_redirects=True,
+                    resp, body = self._get(
+                        url, self._conditional_headers(cached, headers),
                     )
                     if resp.status_code == 304:
                         logger.info("Cache hit (304): %s", url)
@@ -130,38 +403,193 @@ class CachedHttpClient:
             else:
                 # No cache — fresh fetch
                 self._rate_limit()
-                resp = httpx.get(
-                    url, headers=headers or {}, timeout=self.timeout,
-                    follow_redirects=True,
-                )
+                resp, body = self._get(url, headers or {})
         else:
             self._rate_limit()
-            resp = httpx.get(
-                url, headers=headers or {}, timeout=self.timeout,
-                follow_redirects=True,
+            resp, body = self._get(url, headers or {})
+
+        resp.raise_for_status()
+
+        entry = self._entry_from_response(url, resp, body)
+        self._write_cache(url, entry)
+        logger.info("Fetched and cached: %s (%d bytes)", url, len(entry.body))
+        return entry
+
+    def _get(self, url: str, headers: dict[str, str]) -> tuple[httpx.Response, bytes]:
+        """GET a URL, streaming the body through the client's reusable buffer.
+
+        Typical API responses fit the buffer, so they are not regrown chunk
+        by chunk on every fetch; only the final bytes are copied. Bodies
+        announced as larger than a few MB are read directly instead, and
+        the buffer is dropped back to its base size if an unannounced large
+        body grew it, so one bulk download does not stay pinned.
+        """
+        with self._client.stream("GET", url, headers=headers) as resp:
+            if not resp.is_success:
+                return resp, b""
+            hint = resp.headers.get("content-length", "")
+            if hint.isdigit() and int(hint) > _BUF_KEEP_MAX:
+                return resp, resp.read()
+            buf = self._buf
+            size = 0
+            for chunk in resp.iter_bytes(_CHUNK_SIZE):
+                end = size + len(chunk)
+                buf[size:end] = chunk  # grows the buffer past its end
+                size = end
+            with memoryview(buf) as view:
+                body = bytes(view[:size])
+            if len(buf) > _BUF_KEEP_MAX:
+                self._buf = bytearray(_BUF_SIZE)
+            return resp, body
+
+    async def fetch_many(
+        self,
+        urls: list[str],
+        concurrency: int = 8,
+        force: bool = False,
+        headers: dict[str, str] | None = None,
+        return_exceptions: bool = False,
+    ) -> list[CacheEntry | BaseException]:
+        """Fetch many URLs concurrently. Returns entries in input order.
+
+        Same caching semantics as fetch(), but up to `concurrency` requests
+        are in flight at once and the `delay` interval is enforced per host
+        instead of globally. Cache reads and writes run in worker threads so
+        disk I/O does not block the event loop. With `return_exceptions`,
+        failed URLs yield their exception instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        throttle = HostThrottle(self.delay)
+
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=concurrency,
+                                max_connections=concurrency),
+        ) as client:
+            async def fetch_one(url: str) -> CacheEntry:
+                async with semaphore:
+                    return await self._afetch(client, throttle, url, force, headers)
+
+            return await asyncio.gather(
+                *(fetch_one(u) for u in urls), return_exceptions=return_exceptions,
             )
 
+    async def _afetch(
+        self,
+        client: httpx.AsyncClient,
+        throttle: HostThrottle,
+        url: str,
+        force: bool,
+        headers: dict[str, str] | None,
+    ) -> CacheEntry:
+        """Async counterpart of fetch() for a single URL."""
+        cached = None if force else await asyncio.to_thread(self._lookup, url)
+        await throttle.wait(httpx.URL(url).host)
+        if cached and self.prefer_head and (cached.etag or cached.last_modified):
+            try:
+                head = await client.head(
+                    url, headers=self._conditional_headers(cached, headers),
+                )
+                if self._head_matches(cached, head):
+                    return cached
+            except httpx.HTTPError:
+                pass
+            await throttle.wait(httpx.URL(url).host)
+        if cached:
+            try:
+                resp = await client.get(
+                    url, headers=self._conditional_headers(cached, headers),
+                )
+                if resp.status_code == 304:
+                    logger.info("Cache hit (304): %s", url)
+                    return cached
+            except httpx.HTTPError:
+                logger.warning("Conditional request failed, using cache: %s", url)
+                return cached
+        else:
+            resp = await client.get(url, headers=headers or {})
+
         resp.raise_for_status()
 
-        entry = CacheEntry(
+        entry = self._entry_from_response(url, resp)
+        await asyncio.to_thread(self._write_cache, url, entry)
+        logger.info("Fetched and cached: %s (%d bytes)", url, len(entry.body))
+        return entry
+
+    def _unchanged_by_head(
+        self, cached: CacheEntry, headers: dict[str, str] | None,
+    ) -> bool:
+        """Revalidate with a HEAD request. True if the cached body is current."""
+        if not (cached.etag or cached.last_modified):
+            return False
+        self._rate_limit()
+        try:
+            resp = self._client.head(
+                cached.url, headers=self._conditional_headers(cached, headers),
+            )
+        except httpx.HTTPError:
+            return False
+        return self._head_matches(cached, resp)
+
+    @staticmethod
+    def _head_matches(cached: CacheEntry, resp: httpx.Response) -> bool:
+        """Whether a HEAD response shows the cached entry is still current."""
+        if resp.status_code == 304:
+            logger.info("Cache hit (HEAD 304): %s", cached.url)
+            return True
+        if resp.is_success and cached.etag and resp.headers.get("etag") == cached.etag:
+            logger.info("Cache hit (HEAD etag): %s", cached.url)
+            return True
+        return False
+
+    @staticmethod
+    def _conditional_headers(
+        cached: CacheEntry, headers: dict[str, str] | None,
+    ) -> dict[str, str]:
+        """Request headers for revalidating a cached entry."""
+        req_headers = dict(headers or {})
+        if cached.etag:
+            req_headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            req_headers["If-Modified-Since"] = cached.last_modified
+        return req_headers
+
+    @staticmethod
+    def _entry_from_response(
+        url: str, resp: httpx.Response, body: bytes | None = None,
+    ) -> CacheEntry:
+        """Build a fresh CacheEntry from a successful response."""
+        return CacheEntry(
             url=url,
             status_code=resp.status_code,
-            headers=dict(resp.headers),
-            body=resp.content,
+            headers={
+                k: v for k, v in resp.headers.items() if k in _PRESERVED_HEADERS
+            },
+            body=resp.content if body is None else body,
             fetched_at=time.time(),
             etag=resp.headers.get("etag"),
             last_modified=resp.headers.get("last-modified"),
         )
-        self._write_cache(url, entry)
-        logger.info("Fetched and cached: %s (%d bytes)", url, len(entry.body))
-        return entry
 
     def fetch_json(self, url: str, **kwargs: Any) -> Any:
         """Fetch URL and parse as JSON."""
-        entry = self.fetch(url, **kwargs)
-        return json.loads(entry.body)
+        return orjson.loads(self.fetch(url, **kwargs).body)
+
+    def fetch_struct(self, url: str, schema: type[T], **kwargs: Any) -> T:
+        """Fetch URL and decode JSON directly into a msgspec schema.
+
+        Keys not declared on the schema are skipped rather than materialized,
+        which keeps large upstream dumps cheap when only a few fields are used.
+        Decoders are cached per schema on the client.
+        """
+        decoder = self._decoders.get(schema)
+        if decoder is None:
+            decoder = self._decoders[schema] = msgspec.json.Decoder(schema)
+        return decoder.decode(self.fetch(url, **kwargs).body)
 
     def fetch_text(self, url: str, **kwargs: Any) -> str:
         """Fetch URL and return as text."""
         entry = self.fetch(url, **kwargs)
-        return entry.body.decode("utf-8")
+        return str(entry.body, "utf-8")
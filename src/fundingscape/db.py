@@ -2,324 +2,537 @@
 
 from __future__ import annotations
 
-import json
 import os
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from datetime import UTC, date, datetime
 from decimal import Decimal
 from typing import Any
 
 import duckdb
+import orjson
 
 from fundingscape import DB_PATH
 from fundingscape.models import Call, Funder, FundingInstrument, GrantAward
 
 
-def get_connection(path: str | None = None) -> duckdb.DuckDBPyConnection:
-    """Get a DuckDB connection. Creates directory if needed."""
+def get_connection(
+    path: str | None = None, read_only: bool = False,
+) -> duckdb.DuckDBPyConnection:
+    """Get a DuckDB connection. Creates directory if needed.
+
+    With read_only=True the database must already exist; the schema is used
+    as-is, since a read-only connection cannot run migrations.
+    """
     path = path or DB_PATH
+    if read_only:
+        return duckdb.connect(path, read_only=True, config=_resource_config())
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    conn = duckdb.connect(path)
-    create_tables(conn)
+    conn = duckdb.connect(path, config=_resource_config())
+    if _schema_version(conn) < SCHEMA_VERSION:
+        create_tables(conn)
     return conn
 
 
+# Environment overrides for DuckDB resource settings. Dedup's hash joins over
+# grant_award can outgrow RAM on small machines; a memory limit plus a spill
+# directory lets them degrade to disk instead of failing.
+_RESOURCE_ENV = {
+    "memory_limit": "FUNDINGSCAPE_MEMORY_LIMIT",
+    "temp_directory": "FUNDINGSCAPE_TEMP_DIR",
+    "threads": "FUNDINGSCAPE_THREADS",
+}
+
+
+def _resource_config() -> dict[str, str]:
+    """DuckDB config from FUNDINGSCAPE_* env vars; unset ones keep DuckDB defaults."""
+    return {
+        key: os.environ[var] for key, var in _RESOURCE_ENV.items() if os.environ.get(var)
+    }
+
+
+def _schema_version(conn: duckdb.DuckDBPyConnection) -> int:
+    """Schema version recorded by create_tables(), or 0 if never run."""
+    try:
+        return conn.execute("SELECT max(version) FROM schema_meta").fetchone()[0] or 0
+    except duckdb.CatalogException:
+        return 0
+
+
+# Connections with a transaction() block currently open (by id()).
+_open_transactions: set[int] = set()
+
+
+@contextmanager
+def transaction(conn: duckdb.DuckDBPyConnection) -> Iterator[None]:
+    """Run a block in one transaction (one commit instead of one per statement).
+
+    Nested transaction() blocks on the same connection join the outermost
+    one, which owns the commit.
+    """
+    key = id(conn)
+    if key in _open_transactions:
+        yield
+        return
+    conn.execute("BEGIN TRANSACTION")
+    _open_transactions.add(key)
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+    finally:
+        _open_transactions.discard(key)
+
+
+@contextmanager
+def bulk_load(conn: duckdb.DuckDBPyConnection) -> Iterator[None]:
+    """Transaction tuned for large inserts.
+
+    Disables insertion-order preservation (lets DuckDB parallelise and
+    spill less) for the duration, restoring the previous setting afterwards.
+    """
+    previous = conn.execute(
+        "SELECT current_setting('preserve_insertion_order')"
+    ).fetchone()[0]
+    conn.execute("SET preserve_insertion_order = false")
+    try:
+        with transaction(conn):
+            yield
+    finally:
+        conn.execute(f"SET preserve_insertion_order = {bool(previous)}")
+
+
+# Bump whenever _SCHEMA_DDL changes so existing databases re-run it.
+SCHEMA_VERSION = 1
+
+# Full schema as one script: a single parse/plan round trip per connection.
+# Statements are idempotent, so this also migrates older databases.
+_SCHEMA_DDL = """
+CREATE TABLE IF NOT EXISTS funder (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    short_name TEXT,
+    country TEXT,
+    type TEXT NOT NULL,
+    website TEXT,
+    contact TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE SEQUENCE IF NOT EXISTS seq_funder START 1;
+
+CREATE TABLE IF NOT EXISTS funding_instrument (
+    id INTEGER PRIMARY KEY,
+    funder_id INTEGER,
+    name TEXT NOT NULL,
+    short_name TEXT,
+    description TEXT,
+    url TEXT,
+    eligibility_criteria TEXT,
+    typical_duration_months INTEGER,
+    typical_amount_min DOUBLE,
+    typical_amount_max DOUBLE,
+    currency TEXT DEFAULT 'EUR',
+    success_rate DOUBLE,
+    recurrence TEXT,
+    next_deadline DATE,
+    deadline_type TEXT,
+    relevance_tags TEXT[],
+    sme_eligible BOOLEAN DEFAULT FALSE,
+    source TEXT NOT NULL,
+    source_id TEXT,
+    raw_data JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE SEQUENCE IF NOT EXISTS seq_instrument START 1;
+
+CREATE TABLE IF NOT EXISTS call (
+    id INTEGER PRIMARY KEY,
+    instrument_id INTEGER,
+    call_identifier TEXT,
+    title TEXT NOT NULL,
+    description TEXT,
+    url TEXT,
+    opening_date DATE,
+    deadline DATE,
+    deadline_timezone TEXT DEFAULT 'Europe/Brussels',
+    status TEXT NOT NULL,
+    budget_total DOUBLE,
+    currency TEXT DEFAULT 'EUR',
+    expected_grants INTEGER,
+    topic_keywords TEXT[],
+    framework_programme TEXT,
+    programme_division TEXT,
+    source TEXT NOT NULL,
+    source_id TEXT,
+    raw_data JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_call_source_id
+ON call (source_id);
+
+CREATE SEQUENCE IF NOT EXISTS seq_call START 1;
+
+CREATE TABLE IF NOT EXISTS grant_award (
+    id INTEGER PRIMARY KEY,
+    funder_id INTEGER,
+    instrument_id INTEGER,
+    call_id INTEGER,
+    project_title TEXT NOT NULL,
+    project_id TEXT,
+    acronym TEXT,
+    abstract TEXT,
+    pi_name TEXT,
+    pi_institution TEXT,
+    pi_country TEXT,
+    start_date DATE,
+    end_date DATE,
+    total_funding DOUBLE,
+    eu_contribution DOUBLE,
+    currency TEXT DEFAULT 'EUR',
+    status TEXT,
+    partners JSON,
+    topic_keywords TEXT[],
+    source TEXT NOT NULL,
+    source_id TEXT,
+    dedup_of INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Migration: add columns if missing (existing databases)
+ALTER TABLE grant_award ADD COLUMN IF NOT EXISTS dedup_of INTEGER;
+ALTER TABLE grant_award ADD COLUMN IF NOT EXISTS funder_id INTEGER;
+ALTER TABLE grant_award ADD COLUMN IF NOT EXISTS is_aggregate BOOLEAN DEFAULT FALSE;
+ALTER TABLE grant_award ADD COLUMN IF NOT EXISTS total_funding_estimated DOUBLE;
+ALTER TABLE grant_award ADD COLUMN IF NOT EXISTS funding_estimate_method TEXT;
+ALTER TABLE grant_award ADD COLUMN IF NOT EXISTS ror_id TEXT;
+
+-- Indexes for dedup matching
+CREATE INDEX IF NOT EXISTS idx_grant_project_id
+ON grant_award (project_id);
+
+CREATE INDEX IF NOT EXISTS idx_grant_dedup_of
+ON grant_award (dedup_of);
+
+-- Upsert key lookups. Single-column because DuckDB only turns a lone
+-- equality predicate into an index scan; not UNIQUE because older
+-- databases hold duplicate (source, source_id) rows that dedup resolves.
+CREATE INDEX IF NOT EXISTS idx_grant_source_id
+ON grant_award (source_id);
+
+-- Deduplicated view: only canonical records
+CREATE OR REPLACE VIEW grant_award_deduped AS
+SELECT * FROM grant_award
+WHERE dedup_of IS NULL AND (is_aggregate IS NULL OR is_aggregate = FALSE);
+
+CREATE SEQUENCE IF NOT EXISTS seq_grant START 1;
+
+CREATE TABLE IF NOT EXISTS eligibility_profile (
+    id INTEGER PRIMARY KEY,
+    profile_name TEXT NOT NULL,
+    pi_career_stage TEXT,
+    years_since_phd INTEGER,
+    nationality TEXT,
+    institution TEXT,
+    institution_country TEXT,
+    orcid TEXT,
+    research_keywords TEXT[],
+    is_sme BOOLEAN DEFAULT FALSE,
+    company_name TEXT,
+    company_country TEXT,
+    notes TEXT
+);
+
+CREATE TABLE IF NOT EXISTS data_source (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    last_fetch TIMESTAMP,
+    last_success TIMESTAMP,
+    records_fetched INTEGER DEFAULT 0,
+    etag TEXT,
+    last_modified TEXT,
+    status TEXT DEFAULT 'never_fetched',
+    error_message TEXT
+);
+
+CREATE TABLE IF NOT EXISTS change_log (
+    id INTEGER PRIMARY KEY DEFAULT nextval('seq_grant'),
+    entity_type TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    change_type TEXT NOT NULL,
+    field_changed TEXT,
+    old_value TEXT,
+    new_value TEXT,
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
 def create_tables(conn: duckdb.DuckDBPyConnection) -> None:
     """Create all tables if they don't exist."""
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS funder (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            short_name TEXT,
-            country TEXT,
-            type TEXT NOT NULL,
-            website TEXT,
-            contact TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    conn.execute("""
-        CREATE SEQUENCE IF NOT EXISTS seq_funder START 1
-    """)
-
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS funding_instrument (
-            id INTEGER PRIMARY KEY,
-            funder_id INTEGER,
-            name TEXT NOT NULL,
-            short_name TEXT,
-            description TEXT,
-            url TEXT,
-            eligibility_criteria TEXT,
-            typical_duration_months INTEGER,
-            typical_amount_min DOUBLE,
-            typical_amount_max DOUBLE,
-            currency TEXT DEFAULT 'EUR',
-            success_rate DOUBLE,
-            recurrence TEXT,
-            next_deadline DATE,
-            deadline_type TEXT,
-            relevance_tags TEXT[],
-            sme_eligible BOOLEAN DEFAULT FALSE,
-            source TEXT NOT NULL,
-            source_id TEXT,
-            raw_data JSON,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    conn.execute("""
-        CREATE SEQUENCE IF NOT EXISTS seq_instrument START 1
-    """)
-
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS call (
-            id INTEGER PRIMARY KEY,
-            instrument_id INTEGER,
-            call_identifier TEXT,
-            title TEXT NOT NULL,
-            description TEXT,
-            url TEXT,
-            opening_date DATE,
-            deadline DATE,
-            deadline_timezone TEXT DEFAULT 'Europe/Brussels',
-            status TEXT NOT NULL,
-            budget_total DOUBLE,
-            currency TEXT DEFAULT 'EUR',
-            expected_grants INTEGER,
-            topic_keywords TEXT[],
-            framework_programme TEXT,
-            programme_division TEXT,
-            source TEXT NOT NULL,
-            source_id TEXT,
-            raw_data JSON,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    conn.execute("""
-        CREATE SEQUENCE IF NOT EXISTS seq_call START 1
-    """)
-
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS grant_award (
-            id INTEGER PRIMARY KEY,
-            funder_id INTEGER,
-            instrument_id INTEGER,
-            call_id INTEGER,
-            project_title TEXT NOT NULL,
-            project_id TEXT,
-            acronym TEXT,
-            abstract TEXT,
-            pi_name TEXT,
-            pi_institution TEXT,
-            pi_country TEXT,
-            start_date DATE,
-            end_date DATE,
-            total_funding DOUBLE,
-            eu_contribution DOUBLE,
-            currency TEXT DEFAULT 'EUR',
-            status TEXT,
-            partners JSON,
-            topic_keywords TEXT[],
-            source TEXT NOT NULL,
-            source_id TEXT,
-            dedup_of INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Migration: add columns if missing (existing databases)
-    cols = {
-        r[0]
-        for r in conn.execute(
-            "SELECT column_name FROM information_schema.columns "
-            "WHERE table_name='grant_award' AND table_schema='main'"
-        ).fetchall()
-    }
-    if "dedup_of" not in cols:
-        conn.execute("ALTER TABLE grant_award ADD COLUMN dedup_of INTEGER")
-    if "funder_id" not in cols:
-        conn.execute("ALTER TABLE grant_award ADD COLUMN funder_id INTEGER")
-    if "is_aggregate" not in cols:
-        conn.execute("ALTER TABLE grant_award ADD COLUMN is_aggregate BOOLEAN DEFAULT FALSE")
-    if "total_funding_estimated" not in cols:
-        conn.execute("ALTER TABLE grant_award ADD COLUMN total_funding_estimated DOUBLE")
-    if "funding_estimate_method" not in cols:
-        conn.execute("ALTER TABLE grant_award ADD COLUMN funding_estimate_method TEXT")
-    if "ror_id" not in cols:
-        conn.execute("ALTER TABLE grant_award ADD COLUMN ror_id TEXT")
-
-    # Indexes for dedup matching
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_grant_project_id
-        ON grant_award (project_id)
-    """)
-    conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_grant_dedup_of
-        ON grant_award (dedup_of)
-    """)
-
-    # Deduplicated view: only canonical records
-    conn.execute("""
-        CREATE OR REPLACE VIEW grant_award_deduped AS
-        SELECT * FROM grant_award
-        WHERE dedup_of IS NULL AND (is_aggregate IS NULL OR is_aggregate = FALSE)
-    """)
-
-    conn.execute("""
-        CREATE SEQUENCE IF NOT EXISTS seq_grant START 1
-    """)
-
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS eligibility_profile (
-            id INTEGER PRIMARY KEY,
-            profile_name TEXT NOT NULL,
-            pi_career_stage TEXT,
-            years_since_phd INTEGER,
-            nationality TEXT,
-            institution TEXT,
-            institution_country TEXT,
-            orcid TEXT,
-            research_keywords TEXT[],
-            is_sme BOOLEAN DEFAULT FALSE,
-            company_name TEXT,
-            company_country TEXT,
-            notes TEXT
-        )
-    """)
-
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS data_source (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            last_fetch TIMESTAMP,
-            last_success TIMESTAMP,
-            records_fetched INTEGER DEFAULT 0,
-            etag TEXT,
-            last_modified TEXT,
-            status TEXT DEFAULT 'never_fetched',
-            error_message TEXT
-        )
-    """)
-
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS change_log (
-            id INTEGER PRIMARY KEY DEFAULT nextval('seq_grant'),
-            entity_type TEXT NOT NULL,
-            entity_id INTEGER NOT NULL,
-            change_type TEXT NOT NULL,
-            field_changed TEXT,
-            old_value TEXT,
-            new_value TEXT,
-            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    conn.execute(_SCHEMA_DDL)
+    conn.execute(
+        f"CREATE OR REPLACE TABLE schema_meta AS SELECT {SCHEMA_VERSION} AS version"
+    )
+
+
+_GRANT_COLUMNS = """instrument_id, call_id, project_title,
+           project_id, acronym, abstract, pi_name, pi_institution, pi_country,
+           start_date, end_date, total_funding, eu_contribution, currency,
+           status, partners, topic_keywords, source, source_id"""
+
+_INSERT_GRANT_SQL = f"""INSERT INTO grant_award (id, {_GRANT_COLUMNS})
+           VALUES (nextval('seq_grant'), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                   ?, ?, ?, ?, ?, ?)
+           RETURNING id"""
+
+_INSERT_GRANT_WITH_ID_SQL = f"""INSERT INTO grant_award (id, {_GRANT_COLUMNS})
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
 
 
 def insert_funder(conn: duckdb.DuckDBPyConnection, funder: Funder) -> int:
     """Insert a funder and return its ID."""
-    funder_id = conn.execute("SELECT nextval('seq_funder')").fetchone()[0]
-    conn.execute(
+    return conn.execute(
         """INSERT INTO funder (id, name, short_name, country, type, website, contact)
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
-        [funder_id, funder.name, funder.short_name, funder.country,
+           VALUES (nextval('seq_funder'), ?, ?, ?, ?, ?, ?)
+           RETURNING id""",
+        [funder.name, funder.short_name, funder.country,
          funder.type, funder.website, funder.contact],
-    )
-    return funder_id
+    ).fetchone()[0]
+
+
+def _call_row(call: Call) -> list:
+    """Parameter row for a call, in _CALL_STAGING_TYPES order."""
+    return [
+        call.instrument_id, call.call_identifier, call.title,
+        call.description, call.url, call.opening_date, call.deadline,
+        call.deadline_timezone, call.status,
+        float(call.budget_total) if call.budget_total else None,
+        call.currency, call.expected_grants, call.topic_keywords,
+        call.framework_programme, call.programme_division,
+        call.source, call.source_id,
+        orjson.dumps(call.raw_data).decode() if call.raw_data else None,
+    ]
 
 
 def insert_call(conn: duckdb.DuckDBPyConnection, call: Call) -> int:
     """Insert a call and return its ID."""
-    call_id = conn.execute("SELECT nextval('seq_call')").fetchone()[0]
-    conn.execute(
+    return conn.execute(
         """INSERT INTO call (id, instrument_id, call_identifier, title, description,
            url, opening_date, deadline, deadline_timezone, status, budget_total,
            currency, expected_grants, topic_keywords, framework_programme,
            programme_division, source, source_id, raw_data)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        [call_id, call.instrument_id, call.call_identifier, call.title,
-         call.description, call.url, call.opening_date, call.deadline,
-         call.deadline_timezone, call.status,
-         float(call.budget_total) if call.budget_total else None,
-         call.currency, call.expected_grants, call.topic_keywords,
-         call.framework_programme, call.programme_division,
-         call.source, call.source_id,
-         json.dumps(call.raw_data) if call.raw_data else None],
-    )
-    return call_id
+           VALUES (nextval('seq_call'), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                   ?, ?, ?, ?)
+           RETURNING id""",
+        _call_row(call),
+    ).fetchone()[0]
+
+
+def _grant_row(grant: GrantAward) -> list:
+    """Parameter row for a grant, in _GRANT_COLUMNS order."""
+    return [
+        grant.instrument_id, grant.call_id, grant.project_title,
+        grant.project_id, grant.acronym, grant.abstract, grant.pi_name,
+        grant.pi_institution, grant.pi_country, grant.start_date,
+        grant.end_date,
+        float(grant.total_funding) if grant.total_funding else None,
+        float(grant.eu_contribution) if grant.eu_contribution else None,
+        grant.currency, grant.status,
+        orjson.dumps(grant.partners).decode() if grant.partners else None,
+        grant.topic_keywords, grant.source, grant.source_id,
+    ]
 
 
 def insert_grant(conn: duckdb.DuckDBPyConnection, grant: GrantAward) -> int:
     """Insert a grant and return its ID."""
-    grant_id = conn.execute("SELECT nextval('seq_grant')").fetchone()[0]
-    conn.execute(
-        """INSERT INTO grant_award (id, instrument_id, call_id, project_title,
-           project_id, acronym, abstract, pi_name, pi_institution, pi_country,
-           start_date, end_date, total_funding, eu_contribution, currency,
-           status, partners, topic_keywords, source, source_id)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        [grant_id, grant.instrument_id, grant.call_id, grant.project_title,
-         grant.project_id, grant.acronym, grant.abstract, grant.pi_name,
-         grant.pi_institution, grant.pi_country, grant.start_date,
-         grant.end_date,
-         float(grant.total_funding) if grant.total_funding else None,
-         float(grant.eu_contribution) if grant.eu_contribution else None,
-         grant.currency, grant.status,
-         json.dumps(grant.partners) if grant.partners else None,
-         grant.topic_keywords, grant.source, grant.source_id],
+    return conn.execute(_INSERT_GRANT_SQL, _grant_row(grant)).fetchone()[0]
+
+
+def insert_grants_many(
+    conn: duckdb.DuckDBPyConnection, grants: list[GrantAward],
+) -> list[int]:
+    """Insert many grants with one executemany. Returns their IDs in order."""
+    if not grants:
+        return []
+    ids = [r[0] for r in conn.execute(
+        "SELECT nextval('seq_grant') FROM range(?)", [len(grants)],
+    ).fetchall()]
+    conn.executemany(
+        _INSERT_GRANT_WITH_ID_SQL,
+        [[gid, *_grant_row(g)] for gid, g in zip(ids, grants)],
     )
-    return grant_id
+    return ids
 
 
 def upsert_grant(conn: duckdb.DuckDBPyConnection, grant: GrantAward) -> int:
     """Insert or update a grant by source + source_id. Returns the ID."""
-    existing = conn.execute(
-        "SELECT id FROM grant_award WHERE source = ? AND source_id = ?",
-        [grant.source, grant.source_id],
-    ).fetchone()
-    if existing:
-        gid = existing[0]
-        conn.execute(
-            """UPDATE grant_award SET project_title=?, project_id=?, acronym=?,
-               abstract=?, pi_name=?, pi_institution=?, pi_country=?,
-               start_date=?, end_date=?, total_funding=?, eu_contribution=?,
-               status=?, partners=?, topic_keywords=?, updated_at=CURRENT_TIMESTAMP
-               WHERE id=?""",
-            [grant.project_title, grant.project_id, grant.acronym,
-             grant.abstract, grant.pi_name, grant.pi_institution,
-             grant.pi_country, grant.start_date, grant.end_date,
-             float(grant.total_funding) if grant.total_funding else None,
-             float(grant.eu_contribution) if grant.eu_contribution else None,
-             grant.status,
-             json.dumps(grant.partners) if grant.partners else None,
-             grant.topic_keywords, gid],
-        )
-        return gid
+    updated = conn.execute(
+        """UPDATE grant_award SET project_title=?, project_id=?, acronym=?,
+           abstract=?, pi_name=?, pi_institution=?, pi_country=?,
+           start_date=?, end_date=?, total_funding=?, eu_contribution=?,
+           status=?, partners=?, topic_keywords=?, updated_at=CURRENT_TIMESTAMP
+           WHERE id IN (SELECT id FROM grant_award WHERE source_id=?)
+             AND source=?
+           RETURNING id""",
+        [grant.project_title, grant.project_id, grant.acronym,
+         grant.abstract, grant.pi_name, grant.pi_institution,
+         grant.pi_country, grant.start_date, grant.end_date,
+         float(grant.total_funding) if grant.total_funding else None,
+         float(grant.eu_contribution) if grant.eu_contribution else None,
+         grant.status,
+         orjson.dumps(grant.partners).decode() if grant.partners else None,
+         grant.topic_keywords, grant.source_id, grant.source],
+    ).fetchall()
+    if updated:
+        return min(r[0] for r in updated)
     return insert_grant(conn, grant)
 
 
+# Column name -> DuckDB type for bulk staging, in _GRANT_COLUMNS order.
+_GRANT_STAGING_TYPES = {
+    "instrument_id": "INTEGER", "call_id": "INTEGER", "project_title": "TEXT",
+    "project_id": "TEXT", "acronym": "TEXT", "abstract": "TEXT",
+    "pi_name": "TEXT", "pi_institution": "TEXT", "pi_country": "TEXT",
+    "start_date": "DATE", "end_date": "DATE", "total_funding": "DOUBLE",
+    "eu_contribution": "DOUBLE", "currency": "TEXT", "status": "TEXT",
+    "partners": "TEXT", "topic_keywords": "TEXT[]", "source": "TEXT",
+    "source_id": "TEXT",
+}
+
+# Columns refreshed on an existing row, matching upsert_grant().
+_GRANT_UPDATE_COLUMNS = (
+    "project_title", "project_id", "acronym", "abstract", "pi_name",
+    "pi_institution", "pi_country", "start_date", "end_date", "total_funding",
+    "eu_contribution", "status", "partners", "topic_keywords",
+)
+
+
+def bulk_upsert_grants(
+    conn: duckdb.DuckDBPyConnection, grants: Sequence[GrantAward],
+) -> int:
+    """Insert or update many grants by source + source_id in one set-based merge.
+
+    Equivalent to calling upsert_grant() for each grant, but rows are shipped
+    to DuckDB as one column-wise batch and merged with a single UPDATE and a
+    single INSERT. Within the batch the last grant per key wins. Returns the
+    number of distinct grants merged.
+    """
+    latest = {(g.source, g.source_id): g for g in grants}
+    _merge_staged(
+        conn, "grant_award", "seq_grant", _GRANT_STAGING_TYPES,
+        _GRANT_UPDATE_COLUMNS, [_grant_row(g) for g in latest.values()],
+    )
+    return len(latest)
+
+
+# Column name -> DuckDB type for bulk staging of calls, in _call_row() order.
+_CALL_STAGING_TYPES = {
+    "instrument_id": "INTEGER", "call_identifier": "TEXT", "title": "TEXT",
+    "description": "TEXT", "url": "TEXT", "opening_date": "DATE",
+    "deadline": "DATE", "deadline_timezone": "TEXT", "status": "TEXT",
+    "budget_total": "DOUBLE", "currency": "TEXT", "expected_grants": "INTEGER",
+    "topic_keywords": "TEXT[]", "framework_programme": "TEXT",
+    "programme_division": "TEXT", "source": "TEXT", "source_id": "TEXT",
+    "raw_data": "JSON",
+}
+
+# Columns refreshed on an existing row, matching upsert_call().
+_CALL_UPDATE_COLUMNS = (
+    "title", "description", "deadline", "status", "budget_total", "topic_keywords",
+)
+
+
+def bulk_upsert_calls(
+    conn: duckdb.DuckDBPyConnection, calls: Sequence[Call],
+) -> int:
+    """Insert or update many calls by source + source_id in one set-based merge.
+
+    The call counterpart of bulk_upsert_grants(). Calls without a source_id
+    never match an existing row (as with upsert_call()) and are all
+    inserted. Returns the number of distinct calls merged.
+    """
+    latest = {
+        (c.source, c.source_id if c.source_id is not None else id(c)): c
+        for c in calls
+    }
+    _merge_staged(
+        conn, "call", "seq_call", _CALL_STAGING_TYPES,
+        _CALL_UPDATE_COLUMNS, [_call_row(c) for c in latest.values()],
+    )
+    return len(latest)
+
+
+def _merge_staged(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    sequence: str,
+    staging_types: dict[str, str],
+    update_columns: Sequence[str],
+    rows: list[list],
+) -> None:
+    """Merge rows into `table` keyed on source + source_id.
+
+    Rows are shipped column-wise into a temp staging table, then merged
+    with a single UPDATE of `update_columns` and a single INSERT of the
+    rows that matched nothing.
+    """
+    if not rows:
+        return
+    names = list(staging_types)
+    staging = f"_{table}_staging"
+
+    conn.execute(
+        f"CREATE OR REPLACE TEMP TABLE {staging} ("
+        + ", ".join(f"{n} {t}" for n, t in staging_types.items()) + ")"
+    )
+    conn.execute(
+        f"INSERT INTO {staging} SELECT "
+        + ", ".join(f"UNNEST(?::{t}[])" for t in staging_types.values()),
+        [list(col) for col in zip(*rows)],
+    )
+
+    set_clause = ", ".join(f"{c} = s.{c}" for c in update_columns)
+    with transaction(conn):
+        conn.execute(f"""
+            UPDATE {table} t SET {set_clause}, updated_at = CURRENT_TIMESTAMP
+            FROM {staging} s
+            WHERE t.source = s.source AND t.source_id = s.source_id
+        """)
+        conn.execute(f"""
+            INSERT INTO {table} (id, {", ".join(names)})
+            SELECT nextval('{sequence}'), {", ".join(f"s.{n}" for n in names)}
+            FROM {staging} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table} t
+                WHERE t.source = s.source AND t.source_id = s.source_id
+            )
+        """)
+    conn.execute(f"DROP TABLE {staging}")
+
+
 def upsert_call(conn: duckdb.DuckDBPyConnection, call: Call) -> int:
     """Insert or update a call by source + source_id. Returns the ID."""
-    existing = conn.execute(
-        "SELECT id FROM call WHERE source = ? AND source_id = ?",
-        [call.source, call.source_id],
-    ).fetchone()
-    if existing:
-        cid = existing[0]
-        conn.execute(
-            """UPDATE call SET title=?, description=?, deadline=?, status=?,
-               budget_total=?, topic_keywords=?, updated_at=CURRENT_TIMESTAMP
-               WHERE id=?""",
-            [call.title, call.description, call.deadline, call.status,
-             float(call.budget_total) if call.budget_total else None,
-             call.topic_keywords, cid],
-        )
-        return cid
+    updated = conn.execute(
+        """UPDATE call SET title=?, description=?, deadline=?, status=?,
+           budget_total=?, topic_keywords=?, updated_at=CURRENT_TIMESTAMP
+           WHERE id IN (SELECT id FROM call WHERE source_id=?) AND source=?
+           RETURNING id""",
+        [call.title, call.description, call.deadline, call.status,
+         float(call.budget_total) if call.budget_total else None,
+         call.topic_keywords, call.source_id, call.source],
+    ).fetchall()
+    if updated:
+        return min(r[0] for r in updated)
     return insert_call(conn, call)
 
 
@@ -364,8 +577,7 @@ def init_db(path: str | None = None) -> None:
 
 def _seed_funders(conn: duckdb.DuckDBPyConnection) -> None:
     """Seed the funders table with known funding bodies."""
-    existing = conn.execute("SELECT COUNT(*) FROM funder").fetchone()[0]
-    if existing > 0:
+    if conn.execute("SELECT 1 FROM funder LIMIT 1").fetchone() is not None:
         return
 
     funders = [
@@ -399,14 +611,14 @@ def _seed_funders(conn: duckdb.DuckDBPyConnection) -> None:
         Funder(name="MWK Niedersachsen", short_name="MWK-NDS", country="DE",
                type="state_de"),
     ]
-    for f in funders:
-        insert_funder(conn, f)
+    with transaction(conn):
+        for f in funders:
+            insert_funder(conn, f)
 
 
 def _seed_profiles(conn: duckdb.DuckDBPyConnection) -> None:
     """Seed eligibility profiles."""
-    existing = conn.execute("SELECT COUNT(*) FROM eligibility_profile").fetchone()[0]
-    if existing > 0:
+    if conn.execute("SELECT 1 FROM eligibility_profile LIMIT 1").fetchone() is not None:
         return
 
     conn.execute(
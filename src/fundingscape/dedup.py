@@ -18,33 +18,60 @@ from pathlib import Path
 
 import duckdb
 
+from fundingscape.db import transaction
+
 logger = logging.getLogger(__name__)
 
 
+# CORDIS rows that can anchor a project_id match. run_dedup() materializes
+# this once as a temp table; the steps fall back to the inline query when
+# called on their own.
+_CORDIS_PROJECTS = """(
+    SELECT id, project_id FROM grant_award
+    WHERE source = 'cordis_bulk' AND project_id IS NOT NULL AND project_id != ''
+)"""
+
+
 def run_dedup(conn: duckdb.DuckDBPyConnection) -> dict[str, int]:
-    """Run all deduplication steps. Idempotent — clears flags first.
+    """Run all deduplication steps atomically. Idempotent — clears flags first.
 
     Returns dict with counts of enriched and flagged records.
     """
-    # Clear all existing dedup flags so we can re-apply cleanly
-    conn.execute("UPDATE grant_award SET dedup_of = NULL WHERE dedup_of IS NOT NULL")
-
-    dates_fixed = _clean_date_anomalies(conn)
-    countries_fixed = _normalize_country_codes(conn)
-    eu_country_fixed = _normalize_pi_country_eu(conn)
-    currencies_fixed = _normalize_currency_codes(conn)
-    pi_names_fixed = _normalize_pi_names(conn)
-    institutions_fixed = _normalize_institutions(conn)
-    funders_linked = _link_funders(conn)
-    enriched = _enrich_cordis_from_openaire(conn)
-    erc_pis = _enrich_cordis_erc_pis(conn)
-    ec_flagged = _flag_openaire_ec_duplicates(conn)
-    api_flagged = _flag_openaire_api_duplicates(conn)
-    gepris_flagged = _flag_gepris_openaire_duplicates(conn)
-    within_flagged = _flag_within_source_duplicates(conn)
-    aggregates_flagged = _flag_aggregate_records(conn)
-    funding_estimated = _estimate_gepris_funding(conn)
-    ror_matched = _match_ror_institutions(conn)
+    # One transaction for the whole pipeline: a single commit instead of one
+    # per statement, and a failed step leaves the previous flags intact.
+    with transaction(conn):
+        # Clear all existing dedup flags so we can re-apply cleanly. Probe
+        # first: on a fresh load nothing is flagged and the UPDATE would
+        # still scan the table.
+        if conn.execute(
+            "SELECT 1 FROM grant_award WHERE dedup_of IS NOT NULL LIMIT 1"
+        ).fetchone():
+            conn.execute("UPDATE grant_award SET dedup_of = NULL WHERE dedup_of IS NOT NULL")
+        conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE cordis_projects AS SELECT * FROM {_CORDIS_PROJECTS}"
+        )
+
+        dates_fixed = _clean_date_anomalies(conn)
+        countries_fixed = _normalize_country_codes(conn)
+        eu_country_fixed = _normalize_pi_country_eu(conn)
+        currencies_fixed = _normalize_currency_codes(conn)
+        pi_names_fixed = _normalize_pi_names(conn)
+        institutions_fixed = _normalize_institutions(conn)
+        funders_linked = _link_funders(conn)
+        enriched = _enrich_cordis_from_openaire(conn, cordis="cordis_projects")
+        erc_pis = _enrich_cordis_erc_pis(conn)
+        ec_flagged = _flag_openaire_ec_duplicates(conn, cordis="cordis_projects")
+        api_flagged = _flag_openaire_api_duplicates(conn)
+        gepris_flagged = _flag_gepris_openaire_duplicates(conn)
+        within_flagged = _flag_within_source_duplicates(conn)
+        aggregates_flagged = _flag_aggregate_records(conn)
+        funding_estimated = _estimate_gepris_funding(conn)
+        ror_matched = _match_ror_institutions(conn)
+        conn.execute("DROP TABLE cordis_projects")
+
+    # Dedup rewrites dedup_of and several filter columns wholesale; refresh
+    # the optimizer statistics so report queries plan against the new data.
+    conn.execute("ANALYZE grant_award")
 
     stats = {
         "dates_fixed": dates_fixed,
@@ -68,6 +95,34 @@ def run_dedup(conn: duckdb.DuckDBPyConnection) -> dict[str, int]:
     return stats
 
 
+def _count_updated(
+    conn: duckdb.DuckDBPyConnection, sql: str, params: list | None = None,
+) -> int:
+    """Run an UPDATE ... RETURNING statement and return the number of rows changed.
+
+    Replaces the COUNT(*)-then-UPDATE pattern with a single scan.
+    """
+    return len(conn.execute(sql, params or []).fetchall())
+
+
+def _remap_column(
+    conn: duckdb.DuckDBPyConnection, column: str, mapping: dict[str, str],
+) -> int:
+    """Rewrite grant_award.<column> values via `mapping` in one joined UPDATE."""
+    if not mapping:
+        return 0
+    return _count_updated(
+        conn,
+        f"""
+        UPDATE grant_award g SET {column} = m.new
+        FROM (VALUES {", ".join(["(?, ?)"] * len(mapping))}) AS m(old, new)
+        WHERE g.{column} = m.old
+        RETURNING 1
+        """,
+        [v for pair in mapping.items() for v in pair],
+    )
+
+
 def _clean_date_anomalies(conn: duckdb.DuckDBPyConnection) -> dict[str, int]:
     """Fix date anomalies in grant_award.
 
@@ -79,55 +134,45 @@ def _clean_date_anomalies(conn: duckdb.DuckDBPyConnection) -> dict[str, int]:
 
     Returns dict with counts per fix type.
     """
-    counts = {}
-
-    # 1. Swap start > end dates first (before cleaning, so swapped values
-    #    get caught by the subsequent sentinel/range checks)
-    counts["swapped"] = conn.execute(
-        "SELECT COUNT(*) FROM grant_award "
-        "WHERE start_date IS NOT NULL AND end_date IS NOT NULL AND start_date > end_date"
-    ).fetchone()[0]
-    conn.execute("""
-        UPDATE grant_award
-        SET start_date = end_date, end_date = start_date
-        WHERE start_date IS NOT NULL AND end_date IS NOT NULL
-          AND start_date > end_date
-    """)
-
-    # 2. NULL out sentinel and implausible dates
-    counts["sentinel_start"] = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE start_date = '1900-01-01'"
-    ).fetchone()[0]
-    conn.execute("UPDATE grant_award SET start_date = NULL WHERE start_date = '1900-01-01'")
-
-    counts["sentinel_end"] = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE end_date = '9999-12-31'"
-    ).fetchone()[0]
-    conn.execute("UPDATE grant_award SET end_date = NULL WHERE end_date = '9999-12-31'")
-
-    counts["ancient_start"] = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE start_date IS NOT NULL AND YEAR(start_date) < 1950"
-    ).fetchone()[0]
-    conn.execute(
-        "UPDATE grant_award SET start_date = NULL "
-        "WHERE start_date IS NOT NULL AND YEAR(start_date) < 1950"
-    )
-
-    counts["ancient_end"] = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE end_date IS NOT NULL AND YEAR(end_date) < 1950"
-    ).fetchone()[0]
-    conn.execute(
-        "UPDATE grant_award SET end_date = NULL "
-        "WHERE end_date IS NOT NULL AND YEAR(end_date) < 1950"
+    # All five rules are applied in one pass. Swapping comes first so that
+    # swapped values are caught by the sentinel/range checks; within each
+    # column a sentinel takes precedence over the range rules, matching the
+    # order the fixes used to run in as separate statements.
+    swap = "start_date > end_date"
+    start = f"CASE WHEN {swap} THEN end_date ELSE start_date END"
+    end = f"CASE WHEN {swap} THEN start_date ELSE end_date END"
+    too_early, too_late = "DATE '1950-01-01'", "DATE '2040-12-31'"
+    bad_start = f"({start} = DATE '1900-01-01' OR {start} < {too_early})"
+    bad_end = (
+        f"({end} = DATE '9999-12-31' OR {end} < {too_early} OR {end} > {too_late})"
     )
 
-    counts["future_end"] = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE end_date IS NOT NULL AND YEAR(end_date) > 2040"
-    ).fetchone()[0]
-    conn.execute(
-        "UPDATE grant_award SET end_date = NULL "
-        "WHERE end_date IS NOT NULL AND YEAR(end_date) > 2040"
-    )
+    row = conn.execute(f"""
+        SELECT
+            COUNT(*) FILTER (WHERE {swap}),
+            COUNT(*) FILTER (WHERE {start} = DATE '1900-01-01'),
+            COUNT(*) FILTER (WHERE {end} = DATE '9999-12-31'),
+            COUNT(*) FILTER (WHERE {start} < {too_early}
+                             AND {start} != DATE '1900-01-01'),
+            COUNT(*) FILTER (WHERE {end} < {too_early}),
+            COUNT(*) FILTER (WHERE {end} > {too_late}
+                             AND {end} != DATE '9999-12-31')
+        FROM grant_award
+        WHERE start_date IS NOT NULL OR end_date IS NOT NULL
+    """).fetchone()
+    counts = dict(zip(
+        ["swapped", "sentinel_start", "sentinel_end",
+         "ancient_start", "ancient_end", "future_end"],
+        row,
+    ))
+
+    if any(row):
+        conn.execute(f"""
+            UPDATE grant_award
+            SET start_date = CASE WHEN {bad_start} THEN NULL ELSE {start} END,
+                end_date = CASE WHEN {bad_end} THEN NULL ELSE {end} END
+            WHERE {swap} OR {bad_start} OR {bad_end}
+        """)
 
     total = sum(counts.values())
     logger.info("Date cleanup: %d fixes (%s)", total, counts)
@@ -150,11 +195,10 @@ def _normalize_pi_country_eu(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of fixed records.
     """
-    count = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE pi_country = 'EU'"
-    ).fetchone()[0]
+    count = _count_updated(
+        conn, "UPDATE grant_award SET pi_country = NULL WHERE pi_country = 'EU' RETURNING 1"
+    )
     if count:
-        conn.execute("UPDATE grant_award SET pi_country = NULL WHERE pi_country = 'EU'")
         logger.info("Nulled pi_country='EU': %d records", count)
     return count
 
@@ -170,18 +214,9 @@ def _normalize_country_codes(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of fixed records.
     """
-    total = 0
-    for old_code, new_code in _COUNTRY_CODE_MAP.items():
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award WHERE pi_country = ?", [old_code]
-        ).fetchone()[0]
-        if count:
-            conn.execute(
-                "UPDATE grant_award SET pi_country = ? WHERE pi_country = ?",
-                [new_code, old_code],
-            )
-            logger.info("Country code %s → %s: %d records", old_code, new_code, count)
-            total += count
+    total = _remap_column(conn, "pi_country", _COUNTRY_CODE_MAP)
+    if total:
+        logger.info("Country codes normalized: %d records", total)
     return total
 
 
@@ -221,16 +256,16 @@ def _link_funders(conn: duckdb.DuckDBPyConnection) -> int:
     Returns count of grants linked.
     """
     # Ensure OpenAIRE funders exist in funder table
-    for code, (name, country, ftype) in _OPENAIRE_FUNDERS.items():
-        existing = conn.execute(
-            "SELECT id FROM funder WHERE short_name = ?", [code]
-        ).fetchone()
-        if not existing:
-            fid = conn.execute("SELECT nextval('seq_funder')").fetchone()[0]
-            conn.execute(
-                "INSERT INTO funder (id, name, short_name, country, type) VALUES (?, ?, ?, ?, ?)",
-                [fid, name, code, country, ftype],
-            )
+    conn.execute(
+        f"""
+        INSERT INTO funder (id, name, short_name, country, type)
+        SELECT nextval('seq_funder'), v.name, v.code, v.country, v.ftype
+        FROM (VALUES {", ".join(["(?, ?, ?, ?)"] * len(_OPENAIRE_FUNDERS))})
+             AS v(code, name, country, ftype)
+        WHERE NOT EXISTS (SELECT 1 FROM funder f WHERE f.short_name = v.code)
+        """,
+        [v for code, info in _OPENAIRE_FUNDERS.items() for v in (code, *info)],
+    )
 
     # Build funder short_name → id mapping
     funder_map = {
@@ -238,77 +273,27 @@ def _link_funders(conn: duckdb.DuckDBPyConnection) -> int:
         for r in conn.execute("SELECT short_name, id FROM funder WHERE short_name IS NOT NULL").fetchall()
     }
 
-    total = 0
-
-    # Link CORDIS grants to EC
-    ec_id = funder_map.get("EC")
-    if ec_id:
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award WHERE source = 'cordis_bulk' AND funder_id IS NULL"
-        ).fetchone()[0]
-        conn.execute(
-            "UPDATE grant_award SET funder_id = ? WHERE source = 'cordis_bulk' AND funder_id IS NULL",
-            [ec_id],
-        )
-        total += count
-
-    # Link OpenAIRE bulk grants by funder code in source_id
-    for code, fid in funder_map.items():
-        prefix = f"oaire_{code}_"
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award "
-            "WHERE source = 'openaire_bulk' AND funder_id IS NULL AND source_id LIKE ?",
-            [prefix + "%"],
-        ).fetchone()[0]
-        if count:
-            conn.execute(
-                "UPDATE grant_award SET funder_id = ? "
-                "WHERE source = 'openaire_bulk' AND funder_id IS NULL AND source_id LIKE ?",
-                [fid, prefix + "%"],
-            )
-            total += count
-
-    # Link OpenAIRE API grants by funder code in source_id
+    # (source, source_id prefix, funder_id) rules; '' matches any source_id.
+    rules: list[tuple[str, str, int]] = []
+    for source, short_name in (("cordis_bulk", "EC"), ("gepris", "DFG"),
+                               ("foerderkatalog", "BMBF")):
+        if funder_map.get(short_name):
+            rules.append((source, "", funder_map[short_name]))
     for code, fid in funder_map.items():
-        prefix = f"openaire_{code}_"
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award "
-            "WHERE source = 'openaire' AND funder_id IS NULL AND source_id LIKE ?",
-            [prefix + "%"],
-        ).fetchone()[0]
-        if count:
-            conn.execute(
-                "UPDATE grant_award SET funder_id = ? "
-                "WHERE source = 'openaire' AND funder_id IS NULL AND source_id LIKE ?",
-                [fid, prefix + "%"],
-            )
-            total += count
-
-    # Link GEPRIS grants to DFG
-    dfg_id = funder_map.get("DFG")
-    if dfg_id:
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award WHERE source = 'gepris' AND funder_id IS NULL"
-        ).fetchone()[0]
-        if count:
-            conn.execute(
-                "UPDATE grant_award SET funder_id = ? WHERE source = 'gepris' AND funder_id IS NULL",
-                [dfg_id],
-            )
-            total += count
-
-    # Link Förderkatalog grants to BMBF
-    bmbf_id = funder_map.get("BMBF")
-    if bmbf_id:
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award WHERE source = 'foerderkatalog' AND funder_id IS NULL"
-        ).fetchone()[0]
-        if count:
-            conn.execute(
-                "UPDATE grant_award SET funder_id = ? WHERE source = 'foerderkatalog' AND funder_id IS NULL",
-                [bmbf_id],
-            )
-            total += count
+        rules.append(("openaire_bulk", f"oaire_{code}_", fid))
+        rules.append(("openaire", f"openaire_{code}_", fid))
+
+    total = _count_updated(
+        conn,
+        f"""
+        UPDATE grant_award g SET funder_id = m.fid
+        FROM (VALUES {", ".join(["(?, ?, ?)"] * len(rules))}) AS m(source, prefix, fid)
+        WHERE g.source = m.source AND g.funder_id IS NULL
+          AND (m.prefix = '' OR starts_with(g.source_id, m.prefix))
+        RETURNING 1
+        """,
+        [v for rule in rules for v in rule],
+    )
 
     logger.info("Linked %d grants to funders", total)
     return total
@@ -319,18 +304,9 @@ def _normalize_currency_codes(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of fixed records.
     """
-    total = 0
-    for old_code, new_code in _CURRENCY_CODE_MAP.items():
-        count = conn.execute(
-            "SELECT COUNT(*) FROM grant_award WHERE currency = ?", [old_code]
-        ).fetchone()[0]
-        if count:
-            conn.execute(
-                "UPDATE grant_award SET currency = ? WHERE currency = ?",
-                [new_code, old_code],
-            )
-            logger.info("Currency code %s → %s: %d records", old_code, new_code, count)
-            total += count
+    total = _remap_column(conn, "currency", _CURRENCY_CODE_MAP)
+    if total:
+        logger.info("Currency codes normalized: %d records", total)
     return total
 
 
@@ -372,8 +348,8 @@ def _normalize_pi_names(conn: duckdb.DuckDBPyConnection) -> int:
     for prefix in title_prefixes:
         conn.execute(
             "UPDATE grant_award SET pi_name = substr(pi_name, ?) "
-            "WHERE pi_name IS NOT NULL AND pi_name LIKE ?",
-            [len(prefix) + 1, prefix + "%"],
+            "WHERE starts_with(pi_name, ?)",
+            [len(prefix) + 1, prefix],
         )
 
     # Step 2: Remove ", Ph.D." suffix
@@ -457,13 +433,13 @@ def _normalize_institutions(conn: duckdb.DuckDBPyConnection) -> int:
     count = conn.execute("""
         SELECT COUNT(*) FROM grant_award
         WHERE source = 'foerderkatalog'
-          AND pi_institution LIKE 'Keine Anzeige%'
+          AND starts_with(pi_institution, 'Keine Anzeige')
     """).fetchone()[0]
     conn.execute("""
         UPDATE grant_award
         SET pi_institution = NULL
         WHERE source = 'foerderkatalog'
-          AND pi_institution LIKE 'Keine Anzeige%'
+          AND starts_with(pi_institution, 'Keine Anzeige')
     """)
     total += count
 
@@ -479,39 +455,40 @@ def _normalize_institutions(conn: duckdb.DuckDBPyConnection) -> int:
     return total
 
 
-def _enrich_cordis_from_openaire(conn: duckdb.DuckDBPyConnection) -> int:
+def _enrich_cordis_from_openaire(
+    conn: duckdb.DuckDBPyConnection, cordis: str = _CORDIS_PROJECTS,
+) -> int:
     """Copy total_funding and pi_country from OpenAIRE → CORDIS where CORDIS is NULL.
 
     Uses COALESCE semantics: never overwrites existing CORDIS values.
     Returns count of enriched records.
     """
-    # Count how many CORDIS records have gaps that OpenAIRE can fill
-    count = conn.execute("""
-        SELECT COUNT(*) FROM grant_award c
-        WHERE c.source = 'cordis_bulk'
-          AND c.project_id IS NOT NULL
-          AND c.project_id != ''
-          AND (c.total_funding IS NULL OR c.pi_country IS NULL)
-          AND EXISTS (
-              SELECT 1 FROM grant_award o
-              WHERE o.source = 'openaire_bulk'
-                AND o.project_id = c.project_id
-          )
-    """).fetchone()[0]
-
-    conn.execute("""
+    # One aggregate pass over OpenAIRE gives at most one match per project,
+    # so each CORDIS row is updated (and counted) once. Rows where OpenAIRE
+    # has nothing to fill are left alone, keeping updated_at honest.
+    count = _count_updated(conn, f"""
+        WITH oa AS (
+            SELECT
+                project_id,
+                ANY_VALUE(total_funding) AS total_funding,
+                ANY_VALUE(pi_country) AS pi_country
+            FROM grant_award
+            WHERE source = 'openaire_bulk' AND project_id IS NOT NULL
+            GROUP BY project_id
+        )
         UPDATE grant_award AS c
         SET
-            total_funding = COALESCE(c.total_funding, o.total_funding),
-            pi_country = COALESCE(c.pi_country, o.pi_country),
+            total_funding = COALESCE(c.total_funding, oa.total_funding),
+            pi_country = COALESCE(c.pi_country, oa.pi_country),
             updated_at = CURRENT_TIMESTAMP
-        FROM grant_award AS o
-        WHERE c.source = 'cordis_bulk'
-          AND o.source = 'openaire_bulk'
-          AND c.project_id IS NOT NULL
-          AND c.project_id != ''
-          AND c.project_id = o.project_id
-          AND (c.total_funding IS NULL OR c.pi_country IS NULL)
+        FROM {cordis} AS p, oa
+        WHERE c.id = p.id
+          AND oa.project_id = p.project_id
+          AND (
+              (c.total_funding IS NULL AND oa.total_funding IS NOT NULL)
+              OR (c.pi_country IS NULL AND oa.pi_country IS NOT NULL)
+          )
+        RETURNING 1
     """)
     logger.info("Enriched %d CORDIS records from OpenAIRE", count)
     return count
@@ -602,7 +579,9 @@ def _enrich_cordis_erc_pis(conn: duckdb.DuckDBPyConnection) -> int:
     return count
 
 
-def _flag_openaire_ec_duplicates(conn: duckdb.DuckDBPyConnection) -> int:
+def _flag_openaire_ec_duplicates(
+    conn: duckdb.DuckDBPyConnection, cordis: str = _CORDIS_PROJECTS,
+) -> int:
     """Flag OpenAIRE EC-funded records that duplicate CORDIS records.
 
     Matches by project_id. Sets dedup_of = CORDIS record id.
@@ -612,53 +591,20 @@ def _flag_openaire_ec_duplicates(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of flagged records.
     """
-    # Flag openaire_bulk EC records that match CORDIS by project_id
-    conn.execute("""
-        UPDATE grant_award AS o
-        SET dedup_of = (
-            SELECT c.id FROM grant_award c
-            WHERE c.source = 'cordis_bulk'
-              AND c.project_id = o.project_id
-            LIMIT 1
+    count = _count_updated(conn, f"""
+        WITH cordis AS (
+            SELECT project_id, MIN(id) AS id FROM {cordis} GROUP BY project_id
         )
-        WHERE o.source = 'openaire_bulk'
-          AND o.source_id LIKE 'oaire\\_EC\\_%' ESCAPE '\\'
-          AND o.project_id IS NOT NULL
-          AND o.project_id != ''
-          AND EXISTS (
-              SELECT 1 FROM grant_award c
-              WHERE c.source = 'cordis_bulk'
-                AND c.project_id = o.project_id
-          )
-    """)
-
-    # Flag openaire API EC records that match CORDIS by project_id
-    conn.execute("""
         UPDATE grant_award AS o
-        SET dedup_of = (
-            SELECT c.id FROM grant_award c
-            WHERE c.source = 'cordis_bulk'
-              AND c.project_id = o.project_id
-            LIMIT 1
-        )
-        WHERE o.source = 'openaire'
-          AND o.source_id LIKE 'openaire\\_EC\\_%' ESCAPE '\\'
-          AND o.project_id IS NOT NULL
-          AND o.project_id != ''
-          AND EXISTS (
-              SELECT 1 FROM grant_award c
-              WHERE c.source = 'cordis_bulk'
-                AND c.project_id = o.project_id
+        SET dedup_of = cordis.id
+        FROM cordis
+        WHERE o.project_id = cordis.project_id
+          AND (
+              (o.source = 'openaire_bulk' AND starts_with(o.source_id, 'oaire_EC_'))
+              OR (o.source = 'openaire' AND starts_with(o.source_id, 'openaire_EC_'))
           )
+        RETURNING 1
     """)
-
-    count = conn.execute("""
-        SELECT COUNT(*) FROM grant_award
-        WHERE dedup_of IS NOT NULL
-          AND source IN ('openaire_bulk', 'openaire')
-          AND (source_id LIKE 'oaire\\_EC\\_%' ESCAPE '\\'
-               OR source_id LIKE 'openaire\\_EC\\_%' ESCAPE '\\')
-    """).fetchone()[0]
     logger.info("Flagged %d OpenAIRE EC duplicates of CORDIS", count)
     return count
 
@@ -671,31 +617,21 @@ def _flag_openaire_api_duplicates(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of flagged records.
     """
-    conn.execute("""
-        UPDATE grant_award AS api
-        SET dedup_of = (
-            SELECT b.id FROM grant_award b
-            WHERE b.source = 'openaire_bulk'
-              AND b.project_id = api.project_id
-              AND b.dedup_of IS NULL
-            LIMIT 1
+    count = _count_updated(conn, """
+        WITH bulk AS (
+            SELECT project_id, MIN(id) AS id FROM grant_award
+            WHERE source = 'openaire_bulk' AND dedup_of IS NULL
+              AND project_id IS NOT NULL AND project_id != ''
+            GROUP BY project_id
         )
+        UPDATE grant_award AS api
+        SET dedup_of = bulk.id
+        FROM bulk
         WHERE api.source = 'openaire'
           AND api.dedup_of IS NULL
-          AND api.project_id IS NOT NULL
-          AND api.project_id != ''
-          AND EXISTS (
-              SELECT 1 FROM grant_award b
-              WHERE b.source = 'openaire_bulk'
-                AND b.project_id = api.project_id
-                AND b.dedup_of IS NULL
-          )
+          AND api.project_id = bulk.project_id
+        RETURNING 1
     """)
-
-    count = conn.execute(
-        "SELECT COUNT(*) FROM grant_award "
-        "WHERE source = 'openaire' AND dedup_of IS NOT NULL"
-    ).fetchone()[0]
     logger.info("Flagged %d OpenAIRE API duplicates of bulk", count)
     return count
 
@@ -708,50 +644,24 @@ def _flag_gepris_openaire_duplicates(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of flagged records.
     """
-    # Flag openaire_bulk DFG records
-    conn.execute("""
-        UPDATE grant_award AS o
-        SET dedup_of = (
-            SELECT g.id FROM grant_award g
-            WHERE g.source = 'gepris' AND g.project_id = o.project_id
-            LIMIT 1
+    count = _count_updated(conn, """
+        WITH gepris AS (
+            SELECT project_id, MIN(id) AS id FROM grant_award
+            WHERE source = 'gepris'
+              AND project_id IS NOT NULL AND project_id != ''
+            GROUP BY project_id
         )
-        WHERE o.source = 'openaire_bulk'
-          AND o.source_id LIKE 'oaire\\_DFG\\_%' ESCAPE '\\'
-          AND o.project_id IS NOT NULL AND o.project_id != ''
-          AND o.dedup_of IS NULL
-          AND EXISTS (
-              SELECT 1 FROM grant_award g
-              WHERE g.source = 'gepris' AND g.project_id = o.project_id
-          )
-    """)
-
-    # Flag openaire API DFG records
-    conn.execute("""
         UPDATE grant_award AS o
-        SET dedup_of = (
-            SELECT g.id FROM grant_award g
-            WHERE g.source = 'gepris' AND g.project_id = o.project_id
-            LIMIT 1
-        )
-        WHERE o.source = 'openaire'
-          AND o.source_id LIKE 'openaire\\_DFG\\_%' ESCAPE '\\'
-          AND o.project_id IS NOT NULL AND o.project_id != ''
+        SET dedup_of = gepris.id
+        FROM gepris
+        WHERE o.project_id = gepris.project_id
           AND o.dedup_of IS NULL
-          AND EXISTS (
-              SELECT 1 FROM grant_award g
-              WHERE g.source = 'gepris' AND g.project_id = o.project_id
-          )
-    """)
-
-    count = conn.execute("""
-        SELECT COUNT(*) FROM grant_award
-        WHERE dedup_of IS NOT NULL
           AND (
-              (source = 'openaire_bulk' AND source_id LIKE 'oaire\\_DFG\\_%' ESCAPE '\\')
-              OR (source = 'openaire' AND source_id LIKE 'openaire\\_DFG\\_%' ESCAPE '\\')
+              (o.source = 'openaire_bulk' AND starts_with(o.source_id, 'oaire_DFG_'))
+              OR (o.source = 'openaire' AND starts_with(o.source_id, 'openaire_DFG_'))
           )
-    """).fetchone()[0]
+        RETURNING 1
+    """)
     logger.info("Flagged %d OpenAIRE DFG duplicates of GEPRIS", count)
     return count
 
@@ -765,37 +675,20 @@ def _flag_within_source_duplicates(conn: duckdb.DuckDBPyConnection) -> int:
 
     Returns count of flagged records.
     """
-    conn.execute("""
-        UPDATE grant_award AS dup
-        SET dedup_of = (
-            SELECT MIN(g2.id) FROM grant_award g2
-            WHERE g2.source = dup.source
-              AND g2.source_id = dup.source_id
+    count = _count_updated(conn, """
+        WITH canon AS (
+            SELECT id, MIN(id) OVER (PARTITION BY source, source_id) AS min_id
+            FROM grant_award
+            WHERE source_id IS NOT NULL
         )
-        WHERE dup.dedup_of IS NULL
-          AND dup.id != (
-              SELECT MIN(g3.id) FROM grant_award g3
-              WHERE g3.source = dup.source
-                AND g3.source_id = dup.source_id
-          )
-          AND EXISTS (
-              SELECT 1 FROM grant_award g4
-              WHERE g4.source = dup.source
-                AND g4.source_id = dup.source_id
-                AND g4.id != dup.id
-          )
+        UPDATE grant_award AS dup
+        SET dedup_of = canon.min_id
+        FROM canon
+        WHERE dup.id = canon.id
+          AND canon.id != canon.min_id
+          AND dup.dedup_of IS NULL
+        RETURNING 1
     """)
-
-    count = conn.execute("""
-        SELECT COUNT(*) FROM grant_award
-        WHERE dedup_of IS NOT NULL
-          AND source = (
-              SELECT source FROM grant_award g2 WHERE g2.id = grant_award.dedup_of
-          )
-          AND source_id = (
-              SELECT source_id FROM grant_award g2 WHERE g2.id = grant_award.dedup_of
-          )
-    """).fetchone()[0]
     logger.info("Flagged %d within-source duplicates", count)
     return count
 
@@ -820,22 +713,16 @@ def _flag_aggregate_records(conn: duckdb.DuckDBPyConnection) -> int:
     # Reset aggregate flags first (idempotent)
     conn.execute("UPDATE grant_award SET is_aggregate = FALSE WHERE is_aggregate = TRUE")
 
-    # Flag Förderkatalog records above threshold
-    conn.execute(
+    # Flag Förderkatalog records above threshold, and negative funding
+    # records (correction entries) from any source
+    count = _count_updated(
+        conn,
         "UPDATE grant_award SET is_aggregate = TRUE "
-        "WHERE source = 'foerderkatalog' AND total_funding > ?",
+        "WHERE (source = 'foerderkatalog' AND total_funding > ?) "
+        "OR total_funding < 0 "
+        "RETURNING 1",
         [_AGGREGATE_FUNDING_THRESHOLD],
     )
-
-    # Flag negative funding records (correction entries)
-    conn.execute(
-        "UPDATE grant_award SET is_aggregate = TRUE "
-        "WHERE total_funding < 0"
-    )
-
-    count = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE is_aggregate = TRUE"
-    ).fetchone()[0]
     logger.info("Flagged %d aggregate/correction records", count)
     return count
 
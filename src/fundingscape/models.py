@@ -93,6 +93,8 @@ class GrantAward(BaseModel):
     def coerce_decimal(cls, v: Any) -> Decimal | None:
         if v is None or v == "":
             return None
+        if isinstance(v, Decimal):
+            return v
         return Decimal(str(v))
 
 
@@ -207,7 +207,7 @@ def upsert_application(
 ) -> int:
     """Insert or update an application by name. Returns the ID."""
     existing = conn.execute(
-        "SELECT id FROM application WHERE name = ?", [app.name]
+        "SELECT id FROM application WHERE name = ? LIMIT 1", [app.name]
     ).fetchone()
     if existing:
         app_id = existing[0]
@@ -7,51 +7,56 @@ from datetime import date, timedelta
 import duckdb
 
 
+_QUANTUM_CALL_FILTER = """
+    AND (
+        regexp_matches(title, '(?i)quantum|erc|topolog|many-body|entangle')
+        OR len(list_filter(topic_keywords, k ->
+            regexp_matches(k, '(?i)quantum|physics|computing')
+        )) > 0
+        OR regexp_matches(call_identifier, '(?i)erc|msca|quantum')
+    )
+"""
+
+_OPEN_CALLS_SQL = """
+    SELECT
+        call_identifier,
+        title,
+        deadline,
+        status,
+        budget_total,
+        currency,
+        framework_programme,
+        source,
+        url,
+        topic_keywords
+    FROM call
+    WHERE status IN ('open', 'forthcoming')
+    AND (deadline >= CURRENT_DATE OR deadline IS NULL)
+    AND (deadline <= ? OR deadline IS NULL)
+    {filter}
+    ORDER BY deadline ASC NULLS LAST
+    LIMIT ?
+"""
+
+# Both variants are assembled once at import rather than per call.
+_OPEN_CALLS_QUANTUM_SQL = _OPEN_CALLS_SQL.format(filter=_QUANTUM_CALL_FILTER)
+_OPEN_CALLS_ALL_SQL = _OPEN_CALLS_SQL.format(filter="")
+
+
 def open_calls_by_deadline(
     conn: duckdb.DuckDBPyConnection,
     months_ahead: int = 6,
     quantum_only: bool = True,
+    limit: int | None = None,
 ) -> list[dict]:
     """Get open/forthcoming calls ranked by deadline.
 
-    Returns list of dicts with call details + relevance info.
+    Returns list of dicts with call details + relevance info, at most
+    ``limit`` of them if given.
     """
     cutoff = date.today() + timedelta(days=months_ahead * 30)
-    quantum_filter = """
-        AND (
-            title ILIKE '%quantum%'
-            OR title ILIKE '%ERC%'
-            OR title ILIKE '%topolog%'
-            OR title ILIKE '%many-body%'
-            OR title ILIKE '%entangle%'
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE '%quantum%'
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE '%physics%'
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE '%computing%'
-            OR call_identifier ILIKE '%ERC%'
-            OR call_identifier ILIKE '%MSCA%'
-            OR call_identifier ILIKE '%quantum%'
-        )
-    """ if quantum_only else ""
-
-    rows = conn.execute(f"""
-        SELECT
-            call_identifier,
-            title,
-            deadline,
-            status,
-            budget_total,
-            currency,
-            framework_programme,
-            source,
-            url,
-            topic_keywords
-        FROM call
-        WHERE status IN ('open', 'forthcoming')
-        AND (deadline >= CURRENT_DATE OR deadline IS NULL)
-        AND (deadline <= ? OR deadline IS NULL)
-        {quantum_filter}
-        ORDER BY deadline ASC NULLS LAST
-    """, [cutoff]).fetchall()
+    sql = _OPEN_CALLS_QUANTUM_SQL if quantum_only else _OPEN_CALLS_ALL_SQL
+    rows = conn.execute(sql, [cutoff, limit]).fetchall()
 
     return [
         {
@@ -108,15 +113,14 @@ def income_projection(
     Assumes linear burn rate across grant duration.
     """
     rows = conn.execute("""
-        WITH grant_years AS (
+        WITH grant_years AS MATERIALIZED (
             SELECT
-                project_title,
                 acronym,
-                total_funding,
-                start_date,
-                end_date,
-                DATEDIFF('month', start_date, end_date) as duration_months,
-                total_funding / NULLIF(DATEDIFF('month', start_date, end_date), 0) as monthly_rate
+                -- Months as year * 12 + month - 1, so per-year overlap below
+                -- is integer arithmetic instead of date construction.
+                YEAR(start_date) * 12 + MONTH(start_date) - 1 as start_month,
+                YEAR(end_date) * 12 + MONTH(end_date) - 1 as end_month,
+                total_funding / NULLIF(end_month - start_month, 0) as monthly_rate
             FROM grant_award_deduped
             WHERE pi_institution ILIKE ?
             AND status = 'active'
@@ -133,17 +137,15 @@ def income_projection(
             SUM(
                 g.monthly_rate * LEAST(12,
                     GREATEST(0,
-                        DATEDIFF('month',
-                            GREATEST(g.start_date, MAKE_DATE(y.year, 1, 1)),
-                            LEAST(g.end_date, MAKE_DATE(y.year, 12, 31))
-                        )
+                        LEAST(g.end_month, y.year * 12 + 11)
+                        - GREATEST(g.start_month, y.year * 12)
                     )
                 )
             ) as projected_income
         FROM years y
         CROSS JOIN grant_years g
-        WHERE y.year >= YEAR(g.start_date)
-        AND y.year <= YEAR(g.end_date)
+        WHERE y.year >= g.start_month // 12
+        AND y.year <= g.end_month // 12
         GROUP BY y.year
         ORDER BY y.year
     """, [institution_pattern]).fetchall()
@@ -164,23 +166,36 @@ def top_pis_by_field(
     limit: int = 20,
 ) -> list[dict]:
     """Find top PIs in a field by total grant funding."""
+    keyword = field_keyword.lower()
+    # Two-phase aggregation: grouping by acronym first makes each acronym
+    # unique per institution, so the outer ARRAY_AGG needs no DISTINCT set.
     rows = conn.execute("""
+        WITH per_project AS (
+            SELECT
+                pi_institution,
+                pi_country,
+                acronym,
+                COUNT(*) as num_grants,
+                SUM(total_funding) as total_funding
+            FROM grant_award_deduped
+            WHERE (
+                contains(lower(project_title), ?)
+                OR len(list_filter(topic_keywords, k -> contains(lower(k), ?))) > 0
+            )
+            AND pi_institution IS NOT NULL
+            GROUP BY pi_institution, pi_country, acronym
+        )
         SELECT
             pi_institution,
             pi_country,
-            COUNT(*) as num_grants,
+            SUM(num_grants) as num_grants,
             SUM(total_funding) as total_funding,
-            ARRAY_AGG(DISTINCT acronym) FILTER (WHERE acronym IS NOT NULL) as projects
-        FROM grant_award_deduped
-        WHERE (
-            project_title ILIKE ?
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE ?
-        )
-        AND pi_institution IS NOT NULL
+            ARRAY_AGG(acronym) FILTER (WHERE acronym IS NOT NULL) as projects
+        FROM per_project
         GROUP BY pi_institution, pi_country
         ORDER BY total_funding DESC NULLS LAST
         LIMIT ?
-    """, [f"%{field_keyword}%", f"%{field_keyword}%", limit]).fetchall()
+    """, [keyword, keyword, limit]).fetchall()
 
     return [
         {
@@ -203,21 +218,8 @@ def gap_analysis(
     Compares our grants against available instruments/calls.
     """
     rows = conn.execute("""
-        WITH our_sources AS (
-            SELECT DISTINCT source, framework_programme
-            FROM (
-                SELECT source, NULL as framework_programme FROM grant_award_deduped
-                WHERE pi_institution ILIKE ?
-                UNION ALL
-                SELECT 'ft_portal', framework_programme FROM call
-                WHERE call_identifier IN (
-                    SELECT DISTINCT call_identifier FROM call
-                    WHERE status = 'open'
-                )
-            )
-        ),
-        available_programmes AS (
-            SELECT DISTINCT
+        WITH available_programmes AS (
+            SELECT
                 framework_programme,
                 COUNT(*) as open_calls,
                 MIN(deadline) as next_deadline
@@ -237,7 +239,7 @@ def gap_analysis(
             ) THEN 'Applied' ELSE 'Never applied' END as our_status
         FROM available_programmes ap
         ORDER BY ap.open_calls DESC
-    """, [institution_pattern, institution_pattern]).fetchall()
+    """, [institution_pattern]).fetchall()
 
     return [
         {
@@ -255,6 +257,7 @@ def historical_trends(
     field_keyword: str = "quantum",
 ) -> list[dict]:
     """Funding for a field over time by year."""
+    keyword = field_keyword.lower()
     rows = conn.execute("""
         SELECT
             YEAR(start_date) as start_year,
@@ -263,13 +266,13 @@ def historical_trends(
             SUM(eu_contribution) as total_eu
         FROM grant_award_deduped
         WHERE (
-            project_title ILIKE ?
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE ?
+            contains(lower(project_title), ?)
+            OR len(list_filter(topic_keywords, k -> contains(lower(k), ?))) > 0
         )
         AND start_date IS NOT NULL
         GROUP BY YEAR(start_date)
         ORDER BY start_year
-    """, [f"%{field_keyword}%", f"%{field_keyword}%"]).fetchall()
+    """, [keyword, keyword]).fetchall()
 
     return [
         {
@@ -282,7 +285,103 @@ def historical_trends(
     ]
 
 
-def sme_instruments(conn: duckdb.DuckDBPyConnection) -> list[dict]:
+def field_rollups(
+    conn: duckdb.DuckDBPyConnection,
+    field_keyword: str = "quantum",
+    limit: int = 20,
+) -> tuple[list[dict], list[dict]]:
+    """historical_trends() and top_pis_by_field() from a single scan.
+
+    The keyword filter is the expensive part of both; the matches are
+    materialized once and then aggregated by year and by institution.
+    Returns (trends, top_pis) shaped like the two standalone functions.
+    """
+    keyword = field_keyword.lower()
+    rows = conn.execute("""
+        WITH hits AS MATERIALIZED (
+            SELECT
+                YEAR(start_date) as start_year,
+                pi_institution,
+                pi_country,
+                acronym,
+                total_funding,
+                eu_contribution
+            FROM grant_award_deduped
+            WHERE (
+                contains(lower(project_title), ?)
+                OR len(list_filter(topic_keywords, k -> contains(lower(k), ?))) > 0
+            )
+        ),
+        -- Pre-group per project so the institution rollup collects each
+        -- acronym once without a DISTINCT aggregate
+        per_project AS (
+            SELECT
+                pi_institution,
+                pi_country,
+                acronym,
+                COUNT(*) as num_grants,
+                SUM(total_funding) as total_funding
+            FROM hits
+            WHERE pi_institution IS NOT NULL
+            GROUP BY pi_institution, pi_country, acronym
+        ),
+        by_year AS (
+            SELECT
+                start_year,
+                COUNT(*) as num_grants,
+                SUM(total_funding) as total_funding,
+                SUM(eu_contribution) as total_eu
+            FROM hits
+            GROUP BY start_year
+        ),
+        by_institution AS (
+            SELECT
+                pi_institution,
+                pi_country,
+                SUM(num_grants) as num_grants,
+                SUM(total_funding) as total_funding,
+                ARRAY_AGG(acronym) FILTER (WHERE acronym IS NOT NULL) as projects
+            FROM per_project
+            GROUP BY pi_institution, pi_country
+            -- Only the top institutions leave DuckDB
+            QUALIFY row_number() OVER (
+                ORDER BY SUM(total_funding) DESC NULLS LAST
+            ) <= ?
+        )
+        SELECT
+            TRUE as is_year, start_year, NULL, NULL,
+            num_grants, total_funding, total_eu, NULL
+        FROM by_year
+        UNION ALL
+        SELECT
+            FALSE, NULL, pi_institution, pi_country,
+            num_grants, total_funding, NULL, projects
+        FROM by_institution
+        ORDER BY is_year DESC, start_year, total_funding DESC NULLS LAST
+    """, [keyword, keyword, limit]).fetchall()
+
+    trends = [
+        {"year": r[1], "num_grants": r[4], "total_funding": r[5], "total_eu": r[6]}
+        for r in rows
+        if r[0] and r[1] is not None
+    ]
+    top_pis = [
+        {
+            "institution": r[2],
+            "country": r[3],
+            "num_grants": r[4],
+            "total_funding": r[5],
+            "projects": r[7],
+        }
+        for r in rows
+        if not r[0]
+    ]
+    return trends, top_pis
+
+
+def sme_instruments(
+    conn: duckdb.DuckDBPyConnection, limit: int | None = None,
+) -> list[dict]:
     """Find instruments available for Innovailia UG (SME-specific)."""
     rows = conn.execute("""
         SELECT
@@ -296,17 +395,16 @@ def sme_instruments(conn: duckdb.DuckDBPyConnection) -> list[dict]:
             url
         FROM call
         WHERE (
-            ARRAY_TO_STRING(topic_keywords, ' ') ILIKE '%sme%'
-            OR title ILIKE '%SME%'
-            OR title ILIKE '%accelerator%'
-            OR title ILIKE '%innovation%'
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE '%company%'
-            OR ARRAY_TO_STRING(topic_keywords, ' ') ILIKE '%tax_credit%'
-            OR call_identifier ILIKE '%EIC%'
+            len(list_filter(topic_keywords, k ->
+                regexp_matches(k, '(?i)sme|company|tax_credit')
+            )) > 0
+            OR regexp_matches(title, '(?i)sme|accelerator|innovation')
+            OR contains(lower(call_identifier), 'eic')
         )
         AND status IN ('open', 'forthcoming')
         ORDER BY deadline ASC NULLS LAST
-    """).fetchall()
+        LIMIT ?
+    """, [limit]).fetchall()
 
     return [
         {
@@ -3,41 +3,71 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import date, datetime
+from pathlib import Path
 
 import duckdb
 
-from fundingscape.db import get_connection
+from fundingscape.db import get_connection, transaction
 from fundingscape.queries import (
-    funding_landscape_summary,
-    historical_trends,
+    field_rollups,
     income_projection,
     open_calls_by_deadline,
     sme_instruments,
-    top_pis_by_field,
 )
 
 logger = logging.getLogger(__name__)
 
 
 def generate_report(conn: duckdb.DuckDBPyConnection | None = None) -> str:
-    """Generate a comprehensive funding landscape report in Markdown."""
+    """Generate a comprehensive funding landscape report in Markdown.
+
+    Without a connection, opens the default database read-only and closes
+    it afterwards. All sections read from one transaction, so the numbers
+    are consistent with each other even if a loader commits mid-report.
+    """
     if conn is None:
-        conn = get_connection()
+        conn = get_connection(read_only=True)
+        try:
+            return generate_report(conn)
+        finally:
+            conn.close()
 
     sections = []
-    sections.append(_header())
-    sections.append(_executive_summary(conn))
-    sections.append(_deadline_calendar(conn))
-    sections.append(_top_recommended_calls(conn))
-    sections.append(_income_projection(conn))
-    sections.append(_quantum_landscape(conn))
-    sections.append(_sme_section(conn))
-    sections.append(_data_quality(conn))
+    with transaction(conn), _deduped_snapshot(conn):
+        counts = _summary_counts(conn)
+        sections.append(_header())
+        sections.append(_executive_summary(conn, counts))
+        sections.append(_deadline_calendar(conn))
+        sections.append(_top_recommended_calls(conn))
+        sections.append(_income_projection(conn))
+        sections.append(_quantum_landscape(conn))
+        sections.append(_sme_section(conn))
+        sections.append(_data_quality(conn, counts))
 
     return "\n\n".join(sections)
 
 
+@contextmanager
+def _deduped_snapshot(conn: duckdb.DuckDBPyConnection) -> Iterator[None]:
+    """Materialize grant_award_deduped once for the duration of a report.
+
+    The report reads the view from a dozen queries; a temp table of the
+    same name shadows it, so the dedup filter runs once and queries.py is
+    unchanged. Wide text columns no query reads are left out.
+    """
+    conn.execute("""
+        CREATE OR REPLACE TEMP TABLE grant_award_deduped AS
+        SELECT * EXCLUDE (abstract, partners) FROM main.grant_award_deduped
+    """)
+    try:
+        yield
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.grant_award_deduped")
+
+
 def _header() -> str:
     return f"""# EU Research Funding Landscape Intelligence Report
 
@@ -47,24 +77,57 @@ def _header() -> str:
 **Company**: Innovailia UG"""
 
 
-def _executive_summary(conn: duckdb.DuckDBPyConnection) -> str:
-    total_grants = conn.execute("SELECT COUNT(*) FROM grant_award").fetchone()[0]
-    deduped_grants = conn.execute("SELECT COUNT(*) FROM grant_award_deduped").fetchone()[0]
-    duplicate_grants = conn.execute(
-        "SELECT COUNT(*) FROM grant_award WHERE dedup_of IS NOT NULL"
-    ).fetchone()[0]
-    total_calls = conn.execute("SELECT COUNT(*) FROM call").fetchone()[0]
-    open_calls = conn.execute(
-        "SELECT COUNT(*) FROM call WHERE status IN ('open', 'forthcoming')"
-    ).fetchone()[0]
-    active_luh = conn.execute(
-        "SELECT COUNT(*), COALESCE(SUM(total_funding), 0) FROM grant_award_deduped "
-        "WHERE pi_institution ILIKE '%HANNOVER%' AND status = 'active'"
-    ).fetchone()
-    quantum_grants = conn.execute(
-        "SELECT COUNT(*) FROM grant_award_deduped WHERE project_title ILIKE '%quantum%'"
-    ).fetchone()[0]
-
+def _summary_counts(conn: duckdb.DuckDBPyConnection) -> dict[str, int | float]:
+    """Headline grant and call counters shared by the summary and data-quality sections."""
+    # One pass over grant_award and one over call; the deduped filter
+    # mirrors the grant_award_deduped view definition.
+    cur = conn.execute("""
+        WITH g AS (
+            SELECT
+                *,
+                dedup_of IS NULL AND (is_aggregate IS NULL OR is_aggregate = FALSE) AS canonical
+            FROM grant_award
+        ),
+        grants AS (
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE canonical) AS deduped,
+                COUNT(*) FILTER (WHERE dedup_of IS NOT NULL) AS duplicates,
+                COUNT(*) FILTER (
+                    WHERE canonical AND pi_institution ILIKE '%HANNOVER%' AND status = 'active'
+                ) AS luh_count,
+                COALESCE(SUM(total_funding) FILTER (
+                    WHERE canonical AND pi_institution ILIKE '%HANNOVER%' AND status = 'active'
+                ), 0) AS luh_funding,
+                COUNT(*) FILTER (
+                    WHERE canonical AND contains(lower(project_title), 'quantum')
+                ) AS quantum
+            FROM g
+        ),
+        calls AS (
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE status IN ('open', 'forthcoming')) AS open
+            FROM call
+        )
+        SELECT
+            grants.total AS total_grants,
+            grants.deduped AS deduped_grants,
+            grants.duplicates AS duplicate_grants,
+            grants.luh_count,
+            grants.luh_funding,
+            grants.quantum AS quantum_grants,
+            calls.total AS total_calls,
+            calls.open AS open_calls
+        FROM grants, calls
+    """)
+    row = cur.fetchone()
+    return {d[0]: v for d, v in zip(cur.description, row)}
+
+
+def _executive_summary(
+    conn: duckdb.DuckDBPyConnection, counts: dict[str, int | float],
+) -> str:
     sources = conn.execute(
         "SELECT id, name, records_fetched, status FROM data_source ORDER BY id"
     ).fetchall()
@@ -78,14 +141,14 @@ def _executive_summary(conn: duckdb.DuckDBPyConnection) -> str:
 
 | Metric | Value |
 |--------|-------|
-| Total grants in database | {total_grants:,} |
-| Unique grants (deduplicated) | {deduped_grants:,} |
-| Duplicate grants flagged | {duplicate_grants:,} |
-| Total calls in database | {total_calls:,} |
-| Open/forthcoming calls | {open_calls:,} |
-| Active LUH grants (Horizon) | {active_luh[0]:,} |
-| Active LUH grant funding | {active_luh[1]:,.0f} EUR |
-| Quantum-related grants | {quantum_grants:,} |
+| Total grants in database | {counts["total_grants"]:,} |
+| Unique grants (deduplicated) | {counts["deduped_grants"]:,} |
+| Duplicate grants flagged | {counts["duplicate_grants"]:,} |
+| Total calls in database | {counts["total_calls"]:,} |
+| Open/forthcoming calls | {counts["open_calls"]:,} |
+| Active LUH grants (Horizon) | {counts["luh_count"]:,} |
+| Active LUH grant funding | {counts["luh_funding"]:,.0f} EUR |
+| Quantum-related grants | {counts["quantum_grants"]:,} |
 
 ### Data Sources
 
@@ -95,7 +158,7 @@ def _executive_summary(conn: duckdb.DuckDBPyConnection) -> str:
 
 
 def _deadline_calendar(conn: duckdb.DuckDBPyConnection) -> str:
-    calls = open_calls_by_deadline(conn, months_ahead=6, quantum_only=True)
+    calls = open_calls_by_deadline(conn, months_ahead=6, quantum_only=True, limit=30)
 
     if not calls:
         return "## Deadline Calendar (Next 6 Months)\n\nNo relevant open calls found."
@@ -103,7 +166,7 @@ def _deadline_calendar(conn: duckdb.DuckDBPyConnection) -> str:
     lines = ["## Deadline Calendar (Next 6 Months)\n"]
     lines.append("| Deadline | Identifier | Title | Programme | Status |")
     lines.append("|----------|------------|-------|-----------|--------|")
-    for c in calls[:30]:
+    for c in calls:
         deadline = str(c["deadline"]) if c["deadline"] else "Rolling"
         ident = (c["identifier"] or "")[:45]
         title = (c["title"] or "")[:55]
@@ -114,14 +177,14 @@ def _deadline_calendar(conn: duckdb.DuckDBPyConnection) -> str:
 
 
 def _top_recommended_calls(conn: duckdb.DuckDBPyConnection) -> str:
-    calls = open_calls_by_deadline(conn, months_ahead=12, quantum_only=True)
+    calls = open_calls_by_deadline(conn, months_ahead=12, quantum_only=True, limit=20)
 
     if not calls:
         return "## Top Recommended Calls\n\nNo relevant calls found."
 
     lines = ["## Top 20 Recommended Calls (Next 12 Months)\n"]
     lines.append("Ranked by deadline (soonest first), filtered to quantum/physics/ERC/MSCA relevance.\n")
-    for i, c in enumerate(calls[:20], 1):
+    for i, c in enumerate(calls, 1):
         deadline = str(c["deadline"]) if c["deadline"] else "Rolling"
         budget_str = f"{c['budget']:,.0f} EUR" if c["budget"] else "N/A"
         lines.append(f"**{i}. {c['title'][:70]}**")
@@ -154,8 +217,7 @@ def _income_projection(conn: duckdb.DuckDBPyConnection) -> str:
 
 
 def _quantum_landscape(conn: duckdb.DuckDBPyConnection) -> str:
-    trends = historical_trends(conn, "quantum")
-    top_inst = top_pis_by_field(conn, "quantum", limit=15)
+    trends, top_inst = field_rollups(conn, "quantum", limit=15)
 
     lines = ["## Quantum Computing Funding Landscape\n"]
 
@@ -178,7 +240,7 @@ def _quantum_landscape(conn: duckdb.DuckDBPyConnection) -> str:
 
 
 def _sme_section(conn: duckdb.DuckDBPyConnection) -> str:
-    instruments = sme_instruments(conn)
+    instruments = sme_instruments(conn, limit=15)
 
     lines = ["## Innovailia UG — SME Funding Opportunities\n"]
     if not instruments:
@@ -190,14 +252,16 @@ def _sme_section(conn: duckdb.DuckDBPyConnection) -> str:
 
     lines.append("| Deadline | Identifier | Title | Programme |")
     lines.append("|----------|------------|-------|-----------|")
-    for inst in instruments[:15]:
+    for inst in instruments:
         deadline = str(inst["deadline"]) if inst["deadline"] else "Rolling"
         lines.append(f"| {deadline} | {inst['identifier'] or ''} | {inst['title'][:55]} | {inst['programme'] or ''} |")
 
     return "\n".join(lines)
 
 
-def _data_quality(conn: duckdb.DuckDBPyConnection) -> str:
+def _data_quality(
+    conn: duckdb.DuckDBPyConnection, counts: dict[str, int | float],
+) -> str:
     sources = conn.execute("""
         SELECT id, name, records_fetched, last_success, status, error_message
         FROM data_source
@@ -206,16 +270,14 @@ def _data_quality(conn: duckdb.DuckDBPyConnection) -> str:
 
     lines = ["## Data Quality Report\n"]
 
-    # Coverage
-    total_grants = conn.execute("SELECT COUNT(*) FROM grant_award").fetchone()[0]
-    deduped_grants = conn.execute("SELECT COUNT(*) FROM grant_award_deduped").fetchone()[0]
-    duplicate_grants = total_grants - deduped_grants
-    total_calls = conn.execute("SELECT COUNT(*) FROM call").fetchone()[0]
+    # Coverage; here "duplicates" is everything outside the deduplicated
+    # view, i.e. flagged duplicates plus aggregate records
+    excluded_grants = counts["total_grants"] - counts["deduped_grants"]
 
-    lines.append(f"- **Total grants loaded**: {total_grants:,}")
-    lines.append(f"- **Unique grants (deduplicated)**: {deduped_grants:,}")
-    lines.append(f"- **Duplicate grants flagged**: {duplicate_grants:,}")
-    lines.append(f"- **Total calls loaded**: {total_calls:,}")
+    lines.append(f"- **Total grants loaded**: {counts["total_grants"]:,}")
+    lines.append(f"- **Unique grants (deduplicated)**: {counts["deduped_grants"]:,}")
+    lines.append(f"- **Duplicate grants flagged**: {excluded_grants:,}")
+    lines.append(f"- **Total calls loaded**: {counts["total_calls"]:,}")
     lines.append("")
 
     # Source status
@@ -242,6 +304,5 @@ if __name__ == "__main__":
     print(report)
 
     # Also save to file
-    with open("REPORT.md", "w") as f:
-        f.write(report)
+    Path("REPORT.md").write_text(report, encoding="utf-8")
     print("\nReport saved to REPORT.md")
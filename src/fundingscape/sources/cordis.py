@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import io
 import logging
 import os
+import sys
 import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import date
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
+from typing import IO, TextIO
 
 import duckdb
 
 from fundingscape import CACHE_DIR
 from fundingscape.cache import CachedHttpClient
-from fundingscape.db import upsert_grant, update_data_source
+from fundingscape.db import bulk_load, bulk_upsert_grants, update_data_source
 from fundingscape.models import GrantAward
 
 logger = logging.getLogger(__name__)
@@ -27,6 +32,12 @@ CORDIS_URLS = {
 
 SOURCE_ID = "cordis_bulk"
 
+_STATUS_MAP = {
+    "SIGNED": "active",
+    "TERMINATED": "terminated",
+    "CLOSED": "completed",
+}
+
 
 def _parse_date(s: str) -> date | None:
     """Parse CORDIS date string (YYYY-MM-DD)."""
@@ -50,25 +61,31 @@ def _parse_decimal(s: str) -> Decimal | None:
 
 def _parse_status(s: str) -> str | None:
     """Map CORDIS status to our model."""
-    mapping = {
-        "SIGNED": "active",
-        "TERMINATED": "terminated",
-        "CLOSED": "completed",
-    }
-    return mapping.get(s)
+    return _STATUS_MAP.get(s)
+
+
+@contextmanager
+def _open_csv_in_zip(
+    zip_file: str | Path | IO[bytes], csv_name: str,
+) -> Iterator[TextIO]:
+    """Open a CSV inside a zip as a text stream, decompressing as it is read.
+
+    Avoids holding the whole file as bytes plus a decoded copy: CORDIS
+    project.csv runs to hundreds of MB.
+    """
+    with zipfile.ZipFile(zip_file, "r") as zf, zf.open(csv_name) as f:
+        yield io.TextIOWrapper(f, encoding="utf-8", newline="")
 
 
-def _extract_csv_from_zip(zip_path: str | Path, csv_name: str) -> str:
-    """Extract a CSV file from a zip and return its text content."""
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        with zf.open(csv_name) as f:
-            return f.read().decode("utf-8")
+def _csv_stream(csv_text: str | TextIO) -> TextIO:
+    """Accept CSV content either as a string or as an open text stream."""
+    return io.StringIO(csv_text) if isinstance(csv_text, str) else csv_text
 
 
-def _parse_projects_csv(csv_text: str, framework: str) -> list[GrantAward]:
+def _parse_projects_csv(csv_text: str | TextIO, framework: str) -> list[GrantAward]:
     """Parse CORDIS project.csv into GrantAward models."""
     grants = []
-    reader = csv.DictReader(io.StringIO(csv_text), delimiter=";")
+    reader = csv.DictReader(_csv_stream(csv_text), delimiter=";")
     for row in reader:
         project_id = row.get("id", "")
         if not project_id:
@@ -83,7 +100,8 @@ def _parse_projects_csv(csv_text: str, framework: str) -> list[GrantAward]:
             keywords.append(topics)
         funding_scheme = row.get("fundingScheme", "")
         if funding_scheme:
-            keywords.append(funding_scheme)
+            # A few dozen schemes repeat across ~100k rows; share one copy
+            keywords.append(sys.intern(funding_scheme))
 
         grant = GrantAward(
             project_title=row.get("title", "Unknown"),
@@ -104,20 +122,20 @@ def _parse_projects_csv(csv_text: str, framework: str) -> list[GrantAward]:
     return grants
 
 
-def _parse_organizations_csv(csv_text: str) -> dict[str, dict]:
+def _parse_organizations_csv(csv_text: str | TextIO) -> dict[str, dict]:
     """Parse organization.csv to extract coordinator info per project.
 
     Returns {project_id: {pi_name: ..., pi_institution: ..., pi_country: ...}}
     """
     coordinators: dict[str, dict] = {}
-    reader = csv.DictReader(io.StringIO(csv_text), delimiter=";")
+    reader = csv.DictReader(_csv_stream(csv_text), delimiter=";")
     for row in reader:
         if row.get("role") == "coordinator":
             proj_id = row.get("projectID", "")
             if proj_id:
                 coordinators[proj_id] = {
                     "pi_institution": row.get("name", ""),
-                    "pi_country": row.get("country", ""),
+                    "pi_country": sys.intern(row.get("country") or ""),
                 }
     return coordinators
 
@@ -153,30 +171,42 @@ def fetch_and_load(
     total = 0
 
     for fw in frameworks:
-        url = CORDIS_URLS.get(fw)
-        if not url:
+        if fw not in CORDIS_URLS:
             logger.warning("Unknown framework: %s", fw)
-            continue
+    urls = {fw: CORDIS_URLS[fw] for fw in frameworks if fw in CORDIS_URLS}
 
+    # The zips are independent downloads, so fetch them concurrently; parsing
+    # and loading below stay sequential on the single connection.
+    for fw, url in urls.items():
         logger.info("Fetching CORDIS %s bulk data from %s", fw, url)
-        try:
-            entry = client.fetch(url)
-        except Exception as e:
-            logger.error("Failed to fetch CORDIS %s: %s", fw, e)
+    entries = asyncio.run(
+        client.fetch_many(list(urls.values()), return_exceptions=True)
+    )
+
+    for i, fw in enumerate(urls):
+        # Take the entry out of the list so each archive is freed once it
+        # has been handled instead of all of them living until the end
+        entry, entries[i] = entries[i], None
+        if isinstance(entry, BaseException):
+            logger.error("Failed to fetch CORDIS %s: %s", fw, entry)
             update_data_source(
                 conn, f"{SOURCE_ID}_{fw}", f"CORDIS {fw.upper()}", 0,
-                status="error", error=str(e),
+                status="error", error=str(entry),
             )
             continue
 
-        # Write zip to known location for extraction
-        zip_path = Path(client.cache_dir) / f"{fw}-projects.zip"
-        zip_path.write_bytes(entry.body)
+        # Open the archive from the downloaded body rather than writing a
+        # second copy to disk; the cache already keeps one. BytesIO shares a
+        # bytes body, so only a memory-mapped one is copied.
+        with entry:
+            zip_file = io.BytesIO(entry.body)
+        etag, last_modified = entry.etag, entry.last_modified
+        del entry
 
         # Parse projects
         try:
-            project_csv = _extract_csv_from_zip(zip_path, "project.csv")
-            grants = _parse_projects_csv(project_csv, fw)
+            with _open_csv_in_zip(zip_file, "project.csv") as project_csv:
+                grants = _parse_projects_csv(project_csv, fw)
             logger.info("Parsed %d %s projects", len(grants), fw)
         except Exception as e:
             logger.error("Failed to parse CORDIS %s projects: %s", fw, e)
@@ -188,21 +218,22 @@ def fetch_and_load(
 
         # Parse organizations for coordinator info
         try:
-            org_csv = _extract_csv_from_zip(zip_path, "organization.csv")
-            coordinators = _parse_organizations_csv(org_csv)
+            with _open_csv_in_zip(zip_file, "organization.csv") as org_csv:
+                coordinators = _parse_organizations_csv(org_csv)
             _enrich_with_organizations(grants, coordinators)
             logger.info("Enriched with %d coordinator records", len(coordinators))
         except Exception as e:
             logger.warning("Could not parse organizations: %s", e)
+        del zip_file
 
-        # Load into database
-        for grant in grants:
-            upsert_grant(conn, grant)
+        # Load into database as one set-based merge
+        with bulk_load(conn):
+            bulk_upsert_grants(conn, grants)
         total += len(grants)
 
         update_data_source(
             conn, f"{SOURCE_ID}_{fw}", f"CORDIS {fw.upper()}", len(grants),
-            status="ok", etag=entry.etag, last_modified=entry.last_modified,
+            status="ok", etag=etag, last_modified=last_modified,
         )
 
     return total
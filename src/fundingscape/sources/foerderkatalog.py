@@ -25,7 +25,7 @@ import httpx
 from bs4 import BeautifulSoup
 
 from fundingscape import CACHE_DIR
-from fundingscape.db import upsert_grant, update_data_source
+from fundingscape.db import bulk_upsert_grants, update_data_source
 from fundingscape.models import GrantAward
 
 logger = logging.getLogger(__name__)
@@ -403,12 +403,10 @@ def fetch_and_load(
             if detail:
                 details_map[r["fkz"]] = detail
 
-    # Load into database
-    loaded = 0
-    for r in all_results:
-        grant = _result_to_grant(r, details_map.get(r["fkz"]))
-        upsert_grant(conn, grant)
-        loaded += 1
+    # Load into database as one set-based merge
+    grants = [_result_to_grant(r, details_map.get(r["fkz"])) for r in all_results]
+    bulk_upsert_grants(conn, grants)
+    loaded = len(grants)
 
     session.close()
     update_data_source(conn, SOURCE_ID, "BMBF Förderkatalog", loaded, status="ok")
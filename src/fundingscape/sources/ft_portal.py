@@ -4,14 +4,14 @@ from __future__ import annotations
 
 import logging
 import os
-from datetime import UTC, date, datetime
+from datetime import date
 from decimal import Decimal
 
 import duckdb
 
 from fundingscape import CACHE_DIR
 from fundingscape.cache import CachedHttpClient
-from fundingscape.db import upsert_call, update_data_source
+from fundingscape.db import bulk_upsert_calls, update_data_source
 from fundingscape.models import Call
 
 logger = logging.getLogger(__name__)
@@ -25,14 +25,26 @@ RELEVANT_PROGRAMMES = {
     "EURATOM", "COST", "ERASMUS+",
 }
 
+TOPIC_URL = "https://ec.europa.eu/info/funding-tenders/opportunities/portal/screen/opportunities/topic-details/"
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MS_PER_DAY = 86_400_000
+
+_STATUS_MAP = {
+    "open": "open",
+    "closed": "closed",
+    "forthcoming": "forthcoming",
+    "under evaluation": "under_evaluation",
+}
+
 
 def _epoch_ms_to_date(ms: int | None) -> date | None:
-    """Convert Unix epoch milliseconds to date."""
+    """Convert Unix epoch milliseconds to the UTC calendar date."""
     if ms is None:
         return None
     try:
-        return datetime.fromtimestamp(ms / 1000, tz=UTC).date()
-    except (ValueError, OSError):
+        return date.fromordinal(_EPOCH_ORDINAL + ms // _MS_PER_DAY)
+    except (ValueError, OverflowError):
         return None
 
 
@@ -41,13 +53,7 @@ def _map_status(status_obj: dict | None) -> str:
     if not status_obj:
         return "closed"
     abbr = status_obj.get("abbreviation", "").lower()
-    mapping = {
-        "open": "open",
-        "closed": "closed",
-        "forthcoming": "forthcoming",
-        "under evaluation": "under_evaluation",
-    }
-    return mapping.get(abbr, "closed")
+    return _STATUS_MAP.get(abbr, "closed")
 
 
 def _extract_tags(entry: dict) -> list[str]:
@@ -58,34 +64,38 @@ def _extract_tags(entry: dict) -> list[str]:
     return []
 
 
-def parse_calls(data: dict) -> list[Call]:
-    """Parse the grantsTenders.json into Call models."""
+def parse_calls(
+    data: dict,
+    filter_programmes: set[str] | None = None,
+) -> list[Call]:
+    """Parse the grantsTenders.json into Call models.
+
+    If `filter_programmes` is given, only entries whose framework programme
+    starts with one of its prefixes are turned into Calls.
+    """
     calls = []
     entries = data.get("fundingData", {}).get("GrantTenderObj", [])
     logger.info("Total entries in F&T Portal JSON: %d", len(entries))
+    prefixes = tuple(filter_programmes) if filter_programmes else None
 
     for entry in entries:
         # Extract framework programme
         fp = entry.get("frameworkProgramme", {})
         fp_abbr = fp.get("abbreviation", "") if fp else ""
+        if prefixes and not (fp_abbr or "").startswith(prefixes):
+            continue
 
         # Get earliest deadline
         deadlines = entry.get("deadlineDatesLong", [])
         deadline = _epoch_ms_to_date(deadlines[0]) if deadlines else None
 
-        # Budget info
-        budget = None
-        actions = entry.get("actions", [])
-        if actions:
-            for action in actions:
-                # Some actions have budget info
-                pass  # Budget not always at topic level
-
+        # Budget is not reliably given at topic level, so it is left unset
+        identifier = entry.get("identifier", "")
         call = Call(
-            call_identifier=entry.get("identifier", ""),
+            call_identifier=identifier,
             title=entry.get("title", "Untitled"),
             description=entry.get("callTitle"),
-            url=f"https://ec.europa.eu/info/funding-tenders/opportunities/portal/screen/opportunities/topic-details/{entry.get('identifier', '')}",
+            url=TOPIC_URL + identifier,
             opening_date=_epoch_ms_to_date(entry.get("plannedOpeningDateLong")),
             deadline=deadline,
             status=_map_status(entry.get("status")),
@@ -94,7 +104,7 @@ def parse_calls(data: dict) -> list[Call]:
             framework_programme=fp_abbr,
             programme_division=None,
             source=SOURCE_ID,
-            source_id=str(entry.get("ccm2Id", entry.get("identifier", ""))),
+            source_id=str(entry.get("ccm2Id", identifier)),
             raw_data=entry,
         )
         calls.append(call)
@@ -128,24 +138,13 @@ def fetch_and_load(
                           status="error", error=str(e))
         raise
 
-    all_calls = parse_calls(data)
-    logger.info("Parsed %d total calls", len(all_calls))
-
-    # Filter to relevant programmes
-    if filter_programmes:
-        # Match if the framework programme starts with any relevant prefix
-        filtered = []
-        for c in all_calls:
-            fp = c.framework_programme or ""
-            if any(fp.startswith(rp) for rp in filter_programmes):
-                filtered.append(c)
-        logger.info("Filtered to %d calls in relevant programmes", len(filtered))
-    else:
-        filtered = all_calls
-
-    # Load into database
-    for call in filtered:
-        upsert_call(conn, call)
+    # Filter to relevant programmes while parsing, so skipped entries never
+    # become Call objects
+    filtered = parse_calls(data, filter_programmes)
+    logger.info("Parsed %d calls in relevant programmes", len(filtered))
+
+    # Load into database as one set-based merge
+    bulk_upsert_calls(conn, filtered)
 
     update_data_source(conn, SOURCE_ID, "EU F&T Portal", len(filtered), status="ok")
     return len(filtered)
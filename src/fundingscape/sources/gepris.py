@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
@@ -9,11 +10,12 @@ import time
 from datetime import date
 
 import duckdb
+import soupsieve
 from bs4 import BeautifulSoup
 
 from fundingscape import CACHE_DIR
 from fundingscape.cache import CachedHttpClient
-from fundingscape.db import upsert_grant, update_data_source
+from fundingscape.db import bulk_upsert_grants, update_data_source
 from fundingscape.models import GrantAward
 
 logger = logging.getLogger(__name__)
@@ -35,6 +37,47 @@ QUANTUM_KEYWORDS = [
     "Quanteninformation",
 ]
 
+_PROJECT_HREF_RE = re.compile(r"/gepris/projekt/(\d+)")
+_AMOUNT_RE = re.compile(r"([\d.,]+)\s*(?:EUR|€)")
+_TERM_RE = re.compile(r"(\d{4})\s*(?:to|-)\s*(\d{4})")
+
+# CSS selectors compiled once (soupsieve ships with BeautifulSoup)
+_SEL_RESULT = soupsieve.compile("div.results")
+_SEL_RESULT_LINK = soupsieve.compile("h2 a[href*='/gepris/projekt/']")
+_SEL_TITLES = tuple(soupsieve.compile(css) for css in (
+    "h1.facelift", "#detailseite h1:not(.hidden)", ".detail_head h3",
+))
+_SEL_DETAIL_NAME = soupsieve.compile("span.name")
+_SEL_DETAIL_DT = soupsieve.compile(".detail_content .intern dt, .detail_content dt")
+_SEL_ABSTRACT = soupsieve.compile(
+    ".content_frame, .abstract, #projektbeschreibung, .description"
+)
+
+# Detail-page labels to read each field from, in priority order (English
+# labels first, then the German ones used on older pages).
+_FUNDING_FIELDS = ("Gesamtförderung", "Overall Funding", "Funding", "DFG Programme")
+_PI_FIELDS = ("Applicant", "Spokesperson", "Spokespersons", "Antragsteller", "Sprecher")
+_INSTITUTION_FIELDS = (
+    "Applicant Institution",
+    "Institution",
+    "Einrichtung",
+    "Antragstellende Institution",
+    "Co-Applicant Institution",
+    "Host",
+    "Participating Institution",
+    "Participating University",
+    "Partner Organisation",
+)
+
+
+def _first_field(details: dict[str, str], keys: tuple[str, ...]) -> str | None:
+    """Return the first non-empty value among ``keys``."""
+    for key in keys:
+        value = details.get(key)
+        if value:
+            return value
+    return None
+
 
 def _search_projects(
     client: CachedHttpClient,
@@ -74,17 +117,17 @@ def _search_projects(
             logger.error("GEPRIS search failed for '%s' at index %d: %s", keyword, index, e)
             break
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         page_results = []
 
         # Parse search results — each project is in a div.results > h2 > a
-        for item in soup.select("div.results"):
-            link = item.select_one("h2 a[href*='/gepris/projekt/']")
+        for item in _SEL_RESULT.select(soup):
+            link = _SEL_RESULT_LINK.select_one(item)
             if not link:
                 continue
 
             href = link.get("href", "")
-            match = re.search(r"/gepris/projekt/(\d+)", href)
+            match = _PROJECT_HREF_RE.search(href)
             if not match:
                 continue
 
@@ -114,35 +157,64 @@ def _fetch_project_detail(
     project_id: str,
 ) -> GrantAward | None:
     """Fetch and parse a single project detail page."""
-    url = f"{PROJECT_URL}/{project_id}?language=en"
-
     try:
-        html = client.fetch_text(url)
+        html = client.fetch_text(_detail_url(project_id))
     except Exception as e:
         logger.warning("Failed to fetch GEPRIS project %s: %s", project_id, e)
         return None
+    return _parse_project_detail(html, project_id)
+
+
+def _fetch_project_details(
+    client: CachedHttpClient,
+    project_ids: list[str],
+    concurrency: int = 4,
+) -> list[GrantAward]:
+    """Fetch and parse detail pages for many projects concurrently.
+
+    Requests go through CachedHttpClient.fetch_many, which keeps the client's
+    politeness delay between requests to the GEPRIS host. Pages that fail to
+    download are logged and skipped.
+    """
+    entries = asyncio.run(client.fetch_many(
+        [_detail_url(pid) for pid in project_ids],
+        concurrency=concurrency,
+        return_exceptions=True,
+    ))
+    grants = []
+    for project_id, entry in zip(project_ids, entries):
+        if isinstance(entry, BaseException):
+            logger.warning("Failed to fetch GEPRIS project %s: %s", project_id, entry)
+            continue
+        grants.append(_parse_project_detail(str(entry.body, "utf-8"), project_id))
+    return grants
+
 
-    soup = BeautifulSoup(html, "html.parser")
+def _detail_url(project_id: str) -> str:
+    return f"{PROJECT_URL}/{project_id}?language=en"
+
+
+def _parse_project_detail(html: str, project_id: str) -> GrantAward:
+    """Parse a project detail page into a GrantAward."""
+    soup = BeautifulSoup(html, "lxml")
 
     # Extract title — h1.facelift is the project title on GEPRIS detail pages.
     # Try most specific selector first, then fall back.
-    title_el = (
-        soup.select_one("h1.facelift")
-        or soup.select_one("#detailseite h1:not(.hidden)")
-        or soup.select_one(".detail_head h3")
+    title_el = next(
+        (el for sel in _SEL_TITLES if (el := sel.select_one(soup))), None,
     )
     title = title_el.get_text(strip=True) if title_el else f"GEPRIS Project {project_id}"
 
     # Extract details — GEPRIS uses <span class="name"> / sibling pairs
     details: dict[str, str] = {}
-    for span in soup.select("span.name"):
+    for span in _SEL_DETAIL_NAME.select(soup):
         key = span.get_text(strip=True).rstrip(":")
         value_el = span.find_next_sibling()
         if value_el:
             details[key] = value_el.get_text(strip=True)
 
     # Also try dt/dd pattern (older GEPRIS pages)
-    for row in soup.select(".detail_content .intern dt, .detail_content dt"):
+    for row in _SEL_DETAIL_DT.select(soup):
         key = row.get_text(strip=True).rstrip(":")
         dd = row.find_next_sibling("dd")
         if dd and key not in details:
@@ -150,33 +222,27 @@ def _fetch_project_detail(
 
     # Extract abstract/description from content_frame
     abstract = None
-    for section in soup.select(".content_frame, .abstract, #projektbeschreibung, .description"):
+    for section in _SEL_ABSTRACT.select(soup):
         text = section.get_text(strip=True)
         # Skip very short sections (nav labels, tab headers)
         if len(text) > 50:
             abstract = text
             break
 
-    # Parse funding amount
+    # Parse funding amount — first label carrying a parseable amount wins
     total_funding = None
-    for key in ["DFG Programme", "Funding", "Overall Funding", "Gesamtförderung"]:
-        if key in details:
-            amount_match = re.search(r"([\d.,]+)\s*(?:EUR|€)", details[key])
-            if amount_match:
-                amount_str = amount_match.group(1).replace(".", "").replace(",", ".")
-                try:
-                    total_funding = float(amount_str)
-                except ValueError:
-                    pass
+    for key in _FUNDING_FIELDS:
+        amount_match = _AMOUNT_RE.search(details.get(key, ""))
+        if amount_match:
+            amount_str = amount_match.group(1).replace(".", "").replace(",", ".")
+            try:
+                total_funding = float(amount_str)
+                break
+            except ValueError:
+                pass
 
     # Parse PI name — try multiple field names
-    pi_name = (
-        details.get("Applicant")
-        or details.get("Spokesperson")
-        or details.get("Spokespersons")
-        or details.get("Antragsteller")
-        or details.get("Sprecher")
-    )
+    pi_name = _first_field(details, _PI_FIELDS)
     # Clean up "since/until" annotations from spokesperson fields
     if pi_name and ";" in pi_name:
         pi_name = pi_name.split(";")[0].strip()
@@ -186,23 +252,13 @@ def _fetch_project_detail(
         pi_name = pi_name.split(", until ")[0].strip()
 
     # Parse institution — try multiple field names (in priority order)
-    institution = (
-        details.get("Applicant Institution")
-        or details.get("Institution")
-        or details.get("Einrichtung")
-        or details.get("Antragstellende Institution")
-        or details.get("Co-Applicant Institution")
-        or details.get("Host")
-        or details.get("Participating Institution")
-        or details.get("Participating University")
-        or details.get("Partner Organisation")
-    )
+    institution = _first_field(details, _INSTITUTION_FIELDS)
 
     # Parse dates
     term = details.get("Term", details.get("Förderung", ""))
     start_date = None
     end_date = None
-    date_match = re.search(r"(\d{4})\s*(?:to|-)\s*(\d{4})", term)
+    date_match = _TERM_RE.search(term)
     if date_match:
         try:
             start_date = date(int(date_match.group(1)), 1, 1)
@@ -255,43 +311,40 @@ def fetch_and_load(
     if keywords is None:
         keywords = QUANTUM_KEYWORDS
 
-    # Collect unique project IDs from all keyword searches
-    seen_ids: set[str] = set()
-    all_results: list[dict] = []
-
+    # Collect unique project IDs from all keyword searches; the first keyword
+    # to find a project keeps its entry
+    merged: dict[str, dict] = {}
     for kw in keywords:
-        results = _search_projects(client, kw)
-        for r in results:
-            if r["id"] not in seen_ids:
-                seen_ids.add(r["id"])
-                all_results.append(r)
+        for r in _search_projects(client, kw):
+            merged.setdefault(r["id"], r)
+    all_results = list(merged.values())
 
     logger.info("Found %d unique GEPRIS projects across %d keyword searches",
                 len(all_results), len(keywords))
 
     if not fetch_details:
         # Just load basic info from search results
-        loaded = 0
-        for r in all_results:
-            grant = GrantAward(
+        grants = [
+            GrantAward(
                 project_title=r["title"],
                 project_id=r["id"],
                 pi_country="DE",
                 source=SOURCE_ID,
                 source_id=f"gepris_{r['id']}",
             )
-            upsert_grant(conn, grant)
-            loaded += 1
+            for r in all_results
+        ]
+        bulk_upsert_grants(conn, grants)
+        loaded = len(grants)
         update_data_source(conn, SOURCE_ID, "DFG GEPRIS", loaded, status="ok")
         return loaded
 
     # Fetch detail pages (with limit to be respectful)
-    loaded = 0
-    for r in all_results[:max_detail_pages]:
-        grant = _fetch_project_detail(client, r["id"])
-        if grant:
-            upsert_grant(conn, grant)
-            loaded += 1
+    grants = _fetch_project_details(
+        client, [r["id"] for r in all_results[:max_detail_pages]],
+    )
+    bulk_upsert_grants(conn, grants)
+    loaded = len(grants)
 
     update_data_source(conn, SOURCE_ID, "DFG GEPRIS", loaded, status="ok")
     return loaded
@@ -11,7 +11,7 @@ from pathlib import Path
 import yaml
 import duckdb
 
-from fundingscape.db import insert_call, upsert_call, update_data_source
+from fundingscape.db import bulk_upsert_calls, insert_call, update_data_source
 from fundingscape.models import Call, FundingInstrument
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,9 @@ logger = logging.getLogger(__name__)
 SOURCE_ID = "manual"
 MANUAL_DIR = "manual"
 
+# libyaml-backed loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml_instruments(
     conn: duckdb.DuckDBPyConnection,
@@ -37,16 +40,16 @@ def load_yaml_instruments(
     total = 0
     for yaml_file in sorted(yaml_dir.glob("*.yaml")):
         logger.info("Loading manual entries from %s", yaml_file.name)
-        with open(yaml_file) as f:
-            data = yaml.safe_load(f)
+        with open(yaml_file, "rb") as f:
+            data = yaml.load(f, Loader=_YAML_LOADER)
 
         if not data:
             continue
 
-        calls = data.get("calls", [])
-        for call_data in calls:
+        calls = []
+        for call_data in data.get("calls", []):
             try:
-                call = Call(
+                calls.append(Call(
                     call_identifier=call_data.get("id"),
                     title=call_data["title"],
                     description=call_data.get("description"),
@@ -59,12 +62,14 @@ def load_yaml_instruments(
                     framework_programme=call_data.get("programme"),
                     source=SOURCE_ID,
                     source_id=f"manual_{call_data.get('id', call_data['title'][:30])}",
-                )
-                upsert_call(conn, call)
-                total += 1
+                ))
             except Exception as e:
                 logger.error("Failed to load manual call '%s': %s",
                            call_data.get("title", "unknown"), e)
 
+        # One set-based merge per file rather than per call
+        bulk_upsert_calls(conn, calls)
+        total += len(calls)
+
     update_data_source(conn, SOURCE_ID, "Manual Entries", total, status="ok")
     return total
@@ -8,10 +8,10 @@ No authentication required for basic access.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
-import time
 from datetime import date
 from decimal import Decimal, InvalidOperation
 from typing import Any
@@ -20,8 +20,8 @@ import duckdb
 import httpx
 
 from fundingscape import CACHE_DIR
-from fundingscape.cache import CachedHttpClient
-from fundingscape.db import upsert_grant, update_data_source
+from fundingscape.cache import CachedHttpClient, HostThrottle
+from fundingscape.db import bulk_upsert_grants, update_data_source
 from fundingscape.models import GrantAward
 
 logger = logging.getLogger(__name__)
@@ -180,13 +180,13 @@ def _funder_to_country(funder: str) -> str | None:
     return mapping.get(funder)
 
 
-def _fetch_page(
+def _page_params(
     keywords: str,
     funder: str | None = None,
     page: int = 1,
     size: int = PAGE_SIZE,
 ) -> dict:
-    """Fetch a single page from the OpenAIRE API."""
+    """Query parameters for a single page of the OpenAIRE API."""
     params = {
         "keywords": keywords,
         "format": "json",
@@ -195,10 +195,20 @@ def _fetch_page(
     }
     if funder:
         params["funder"] = funder
+    return params
 
-    resp = httpx.get(BASE_URL, params=params, timeout=30.0, follow_redirects=True)
-    resp.raise_for_status()
-    return resp.json()
+
+def _page_results(data: dict) -> tuple[list[dict], int]:
+    """Split an API page into its result records and the reported total."""
+    response = data.get("response", {})
+    total = int(response.get("header", {}).get("total", {}).get("$", 0))
+    results = response.get("results", {})
+    if not results or "result" not in results:
+        return [], total
+    result_list = results["result"]
+    if not isinstance(result_list, list):
+        result_list = [result_list]
+    return result_list, total
 
 
 def fetch_grants_for_funder(
@@ -206,56 +216,108 @@ def fetch_grants_for_funder(
     keywords: list[str] | None = None,
     max_pages: int = 50,
     delay: float = 1.0,
+    concurrency: int = 4,
 ) -> list[GrantAward]:
     """Fetch all quantum-related grants for a specific funder.
 
+    Keywords are queried concurrently: the first page of each tells how
+    many pages there are, then the remaining pages are fetched together.
+    At most `concurrency` requests are in flight and request starts are
+    spaced `delay` seconds apart.
+
     Returns list of parsed GrantAward objects.
     """
     if keywords is None:
         keywords = DEEPTECH_KEYWORDS
 
-    all_grants: dict[str, GrantAward] = {}  # deduplicate by source_id
-
-    for kw in keywords:
-        page = 1
-        while page <= max_pages:
-            try:
-                data = _fetch_page(kw, funder=funder, page=page)
-            except Exception as e:
-                logger.warning("OpenAIRE fetch failed for %s/%s page %d: %s",
-                             funder, kw, page, e)
-                break
-
-            header = data.get("response", {}).get("header", {})
-            total = int(header.get("total", {}).get("$", 0))
-            results = data.get("response", {}).get("results", {})
-
-            if not results or "result" not in results:
-                break
-
-            result_list = results["result"]
-            if not isinstance(result_list, list):
-                result_list = [result_list]
+    pages_per_keyword = asyncio.run(_fetch_keyword_pages(
+        funder, keywords, max_pages, delay, concurrency,
+    ))
 
+    # Deduplicate by source_id; earlier keywords and pages win, as if the
+    # pages had been fetched one after another
+    all_grants: dict[str, GrantAward] = {}
+    for pages in pages_per_keyword:
+        for result_list in pages:
             for r in result_list:
                 grant = _parse_project(r)
                 if grant and grant.source_id not in all_grants:
                     all_grants[grant.source_id] = grant
 
-            logger.debug("OpenAIRE %s/%s: page %d, got %d results (total: %d)",
-                        funder, kw, page, len(result_list), total)
-
-            # Check if we've fetched all pages
-            if page * PAGE_SIZE >= total:
-                break
-            page += 1
-            time.sleep(delay)
-
     logger.info("OpenAIRE %s: fetched %d unique grants across %d keywords",
                funder, len(all_grants), len(keywords))
     return list(all_grants.values())
 
 
+async def _fetch_keyword_pages(
+    funder: str,
+    keywords: list[str],
+    max_pages: int,
+    delay: float,
+    concurrency: int,
+) -> list[list[list[dict]]]:
+    """Fetch result pages for every keyword. Returns pages per keyword, in order.
+
+    A keyword's pages stop at the first page that fails or comes back empty.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    throttle = HostThrottle(delay)
+    host = httpx.URL(BASE_URL).host
+
+    # One pooled client per funder: keyword and page requests share
+    # keep-alive HTTP/2 connections instead of a handshake each
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=concurrency,
+                            max_connections=concurrency),
+    ) as client:
+        async def fetch(kw: str, page: int) -> dict:
+            async with semaphore:
+                await throttle.wait(host)
+                resp = await client.get(
+                    BASE_URL, params=_page_params(kw, funder=funder, page=page),
+                )
+                resp.raise_for_status()
+                return resp.json()
+
+        async def fetch_keyword(kw: str) -> list[list[dict]]:
+            if max_pages < 1:
+                return []
+            pages: list[list[dict]] = []
+            try:
+                first = await fetch(kw, 1)
+            except Exception as e:
+                logger.warning("OpenAIRE fetch failed for %s/%s page 1: %s",
+                             funder, kw, e)
+                return pages
+            result_list, total = _page_results(first)
+            if not result_list:
+                return pages
+            pages.append(result_list)
+
+            last_page = min(max_pages, -(-total // PAGE_SIZE))
+            rest = await asyncio.gather(
+                *(fetch(kw, page) for page in range(2, last_page + 1)),
+                return_exceptions=True,
+            )
+            for page, data in enumerate(rest, start=2):
+                if isinstance(data, BaseException):
+                    logger.warning("OpenAIRE fetch failed for %s/%s page %d: %s",
+                                 funder, kw, page, data)
+                    break
+                result_list, _ = _page_results(data)
+                if not result_list:
+                    break
+                pages.append(result_list)
+            logger.debug("OpenAIRE %s/%s: %d pages (total: %d)",
+                        funder, kw, len(pages), total)
+            return pages
+
+        return await asyncio.gather(*(fetch_keyword(kw) for kw in keywords))
+
+
 def fetch_and_load(
     conn: duckdb.DuckDBPyConnection,
     funders: list[str] | None = None,
@@ -286,8 +348,7 @@ def fetch_and_load(
             logger.error("OpenAIRE %s failed: %s", funder, e)
             continue
 
-        for grant in grants:
-            upsert_grant(conn, grant)
+        bulk_upsert_grants(conn, grants)
         total_loaded += len(grants)
 
         logger.info("OpenAIRE %s: loaded %d grants into DB", funder, len(grants))
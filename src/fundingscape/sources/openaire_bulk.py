@@ -3,27 +3,24 @@
 Downloads and parses the full OpenAIRE Graph project.tar (~620 MB)
 containing ALL projects from ALL funders (~3.8M records).
 
-Uses DuckDB batch loading for performance instead of row-by-row upserts.
+The gzipped JSONL shards are scanned by DuckDB's JSON reader and every field
+is derived in SQL, so records never pass through Python.
 """
 
 from __future__ import annotations
 
-import csv
-import gzip
-import io
-import json
 import logging
 import os
+import shutil
 import tarfile
 import tempfile
 import time
-from datetime import date
 from pathlib import Path
 
 import duckdb
 
 from fundingscape import CACHE_DIR
-from fundingscape.db import create_tables, update_data_source
+from fundingscape.db import create_tables, transaction, update_data_source
 
 logger = logging.getLogger(__name__)
 
@@ -31,217 +28,128 @@ SOURCE_ID = "openaire_bulk"
 ZENODO_URL = "https://zenodo.org/api/records/17725827/files/project.tar/content"
 TAR_PATH = os.path.join(CACHE_DIR, "openaire", "project.tar")
 
+_COPY_CHUNK = 1 << 20
 
-def _parse_date(s: str | None) -> str | None:
-    """Return ISO date string or None."""
-    if not s:
-        return None
-    try:
-        date.fromisoformat(s[:10])
-        return s[:10]
-    except ValueError:
-        return None
 
+def _extract_shards(tar_path: str, scratch_dir: str) -> list[str]:
+    """Copy the gzipped JSONL shards out of the tar into `scratch_dir`.
 
-def _extract_to_csv(tar_path: str, csv_path: str) -> int:
-    """Extract the tar into a flat CSV for DuckDB bulk loading.
-
-    Returns the number of records written.
+    Shards stay compressed; DuckDB decompresses them while scanning.
+    Members are streamed in archive order, so copying starts with the
+    first header instead of after indexing the whole tar. Returns the
+    shard paths in that order.
     """
-    count = 0
-    with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile, delimiter="\t", quoting=csv.QUOTE_MINIMAL)
-        writer.writerow([
-            "source_id", "project_title", "project_id", "acronym",
-            "pi_country", "start_date", "end_date",
-            "total_funding", "currency", "status",
-            "funder_short", "funder_name", "funding_stream",
-            "keywords", "abstract",
-        ])
-
-        with tarfile.open(tar_path, "r") as tar:
-            for member in sorted(tar.getmembers(), key=lambda m: m.name):
-                if not member.name.endswith(".gz"):
-                    continue
-                logger.info("Processing %s", member.name)
-                f = tar.extractfile(member)
-                if not f:
-                    continue
-
-                with gzip.open(f, "rt", encoding="utf-8") as gz:
-                    for line in gz:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            proj = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-
-                        title = proj.get("title")
-                        if not title or title == "unidentified":
-                            continue
-
-                        project_id = proj.get("code", "")
-                        openaire_id = proj.get("id", "")
-                        fundings = proj.get("fundings") or []
-                        granted = proj.get("granted") or {}
-
-                        # Funder info
-                        funder_short = ""
-                        funder_name = ""
-                        funding_stream = ""
-                        country = None
-                        for fund in fundings:
-                            funder_short = fund.get("shortName", "") or ""
-                            funder_name = fund.get("name", "") or ""
-                            country = fund.get("jurisdiction")
-                            if country == "EU":
-                                country = None  # Not a valid ISO country code
-                            stream = fund.get("fundingStream") or {}
-                            funding_stream = stream.get("description", "") or ""
-                            break  # Use first funder
-
-                        # Funding amount
-                        amount = None
-                        currency = granted.get("currency", "EUR") or "EUR"
-                        funded = granted.get("fundedAmount")
-                        if funded and float(funded) > 0:
-                            amount = float(funded)
-                        else:
-                            total = granted.get("totalCost")
-                            if total and float(total) > 0:
-                                amount = float(total)
-
-                        # Dates
-                        start_date = _parse_date(proj.get("startDate"))
-                        end_date = _parse_date(proj.get("endDate"))
-
-                        # Status
-                        status = "completed"
-                        if end_date:
-                            try:
-                                if date.fromisoformat(end_date) >= date.today():
-                                    status = "active"
-                            except ValueError:
-                                pass
-                        elif start_date:
-                            try:
-                                if date.fromisoformat(start_date).year >= 2023:
-                                    status = "active"
-                            except ValueError:
-                                pass
-
-                        # Keywords
-                        kw_str = proj.get("keywords") or ""
-                        keywords = funder_short
-                        if kw_str:
-                            keywords = f"{funder_short};{kw_str[:200]}"
-
-                        # Source ID
-                        sid = f"oaire_{funder_short}_{project_id}" if project_id and project_id != "unidentified" else f"oaire_{openaire_id[:24]}"
-
-                        # Abstract — present in ~11% of records (UKRI/ARC 100%, EC 78%, etc.)
-                        # See scripts/enrich_openaire_abstracts.py for one-shot backfill of cached tar
-                        abstract = proj.get("summary") or ""
-                        if abstract:
-                            abstract = " ".join(abstract.split())[:10000]
-
-                        # Sanitize text fields: remove tabs/newlines
-                        clean_title = title.replace("\t", " ").replace("\n", " ").replace("\r", "")[:500]
-                        clean_acronym = (proj.get("acronym") or "").replace("\t", " ")
-                        clean_funder = funder_name.replace("\t", " ")[:200]
-                        clean_stream = funding_stream.replace("\t", " ")[:200]
-                        clean_kw = keywords.replace("\t", " ").replace("\n", " ")[:300]
-                        clean_abstract = abstract.replace("\t", " ")
-
-                        writer.writerow([
-                            sid, clean_title, project_id, clean_acronym,
-                            country or "", start_date or "", end_date or "",
-                            amount or "", currency, status,
-                            funder_short, clean_funder, clean_stream,
-                            clean_kw, clean_abstract,
-                        ])
-                        count += 1
-
-                        if count % 100000 == 0:
-                            logger.info("Extracted %d records...", count)
-
-    logger.info("Extracted %d total records to CSV", count)
-    return count
-
-
-def load_csv_to_db(
+    paths = []
+    with tarfile.open(tar_path, "r") as tar:
+        for member in tar:
+            if not member.isfile() or not member.name.endswith(".gz"):
+                continue
+            f = tar.extractfile(member)
+            if not f:
+                continue
+            path = os.path.join(scratch_dir, f"{len(paths):05d}.json.gz")
+            with f, open(path, "wb") as out:
+                shutil.copyfileobj(f, out, _COPY_CHUNK)
+            paths.append(path)
+    return paths
+
+
+# Python's str.split() whitespace, which RE2's \s alone does not cover
+_WHITESPACE_RE = r"[\s\x0b\x1c-\x1f\x85\pZ]+"
+
+# Only the fields the loader reads; other keys in the dump are skipped
+_PROJECT_COLUMNS = {
+    "id": "VARCHAR",
+    "code": "VARCHAR",
+    "acronym": "VARCHAR",
+    "title": "VARCHAR",
+    "startDate": "VARCHAR",
+    "endDate": "VARCHAR",
+    "keywords": "VARCHAR",
+    "summary": "VARCHAR",
+    "fundings": "STRUCT(shortName VARCHAR, jurisdiction VARCHAR)[]",
+    "granted": "STRUCT(currency VARCHAR, totalCost DOUBLE, fundedAmount DOUBLE)",
+}
+
+
+def load_shards_to_db(
     conn: duckdb.DuckDBPyConnection,
-    csv_path: str,
+    shard_paths: list[str],
 ) -> int:
-    """Bulk-load the extracted CSV into DuckDB.
+    """Replace all openaire_bulk grants with the projects in `shard_paths`.
 
-    This is MUCH faster than row-by-row upserts.
+    DuckDB's JSON reader scans the gzipped JSONL shards directly and every
+    field is derived in SQL, so no record passes through Python. Lines that
+    are not valid JSON are skipped. Returns the number of grants loaded.
     """
-    # First, drop existing openaire_bulk data
-    conn.execute("DELETE FROM grant_award WHERE source = ?", [SOURCE_ID])
-
-    # Load via DuckDB's CSV reader directly into the table
-    conn.execute(f"""
-        INSERT INTO grant_award (
-            id, project_title, project_id, acronym, abstract,
-            pi_country, start_date, end_date,
-            total_funding, currency, status,
-            topic_keywords, source, source_id
-        )
-        SELECT
-            nextval('seq_grant'),
-            project_title,
-            project_id,
-            CASE WHEN acronym = '' THEN NULL ELSE acronym END,
-            CASE WHEN abstract = '' THEN NULL ELSE abstract END,
-            CASE WHEN pi_country = '' THEN NULL ELSE pi_country END,
-            CASE WHEN start_date = '' THEN NULL ELSE CAST(start_date AS DATE) END,
-            CASE WHEN end_date = '' THEN NULL ELSE CAST(end_date AS DATE) END,
-            CASE WHEN total_funding = '' THEN NULL ELSE CAST(total_funding AS DOUBLE) END,
-            currency,
-            status,
-            string_split(keywords, ';'),
-            '{SOURCE_ID}',
-            source_id
-        FROM read_csv('{csv_path}',
-            header=true,
-            auto_detect=false,
-            delim='\t',
-            quote='',
-            ignore_errors=true,
-            columns={{
-                'source_id': 'VARCHAR',
-                'project_title': 'VARCHAR',
-                'project_id': 'VARCHAR',
-                'acronym': 'VARCHAR',
-                'pi_country': 'VARCHAR',
-                'start_date': 'VARCHAR',
-                'end_date': 'VARCHAR',
-                'total_funding': 'VARCHAR',
-                'currency': 'VARCHAR',
-                'status': 'VARCHAR',
-                'funder_short': 'VARCHAR',
-                'funder_name': 'VARCHAR',
-                'funding_stream': 'VARCHAR',
-                'keywords': 'VARCHAR',
-                'abstract': 'VARCHAR'
-            }}
-        )
-    """)
-
-    count = conn.execute(
+    columns = ", ".join(f"{k}: '{v}'" for k, v in _PROJECT_COLUMNS.items())
+    with transaction(conn):
+        conn.execute("DELETE FROM grant_award WHERE source = ?", [SOURCE_ID])
+        if not shard_paths:
+            return 0
+        conn.execute(f"""
+            INSERT INTO grant_award (
+                id, project_title, project_id, acronym, abstract,
+                pi_country, start_date, end_date,
+                total_funding, currency, status,
+                topic_keywords, source, source_id
+            )
+            WITH projects AS (
+                SELECT
+                    *,
+                    coalesce(fundings[1].shortName, '') AS funder_short,
+                    TRY_CAST(left(startDate, 10) AS DATE) AS start,
+                    TRY_CAST(left(endDate, 10) AS DATE) AS "end",
+                    CASE WHEN coalesce(keywords, '') = '' THEN funder_short
+                         ELSE funder_short || ';' || left(keywords, 200)
+                    END AS kw
+                FROM read_ndjson(
+                    ?, compression = 'gzip', ignore_errors = true,
+                    columns = {{{columns}}}
+                )
+                WHERE coalesce(title, '') NOT IN ('', 'unidentified')
+            )
+            SELECT
+                nextval('seq_grant'),
+                left(replace(replace(replace(title, chr(9), ' '), chr(10), ' '),
+                             chr(13), ''), 500),
+                nullif(code, ''),
+                nullif(replace(acronym, chr(9), ' '), ''),
+                nullif(left(trim(regexp_replace(summary, ?, ' ', 'g')), 10000), ''),
+                -- EU is a funding jurisdiction, not an ISO country code
+                nullif(nullif(fundings[1].jurisdiction, 'EU'), ''),
+                start,
+                "end",
+                CASE WHEN granted.fundedAmount > 0 THEN granted.fundedAmount
+                     WHEN granted.totalCost > 0 THEN granted.totalCost
+                END,
+                coalesce(nullif(granted.currency, ''), 'EUR'),
+                CASE WHEN "end" IS NOT NULL
+                         THEN CASE WHEN "end" >= current_date THEN 'active'
+                                   ELSE 'completed' END
+                     WHEN year(start) >= 2023 THEN 'active'
+                     ELSE 'completed'
+                END,
+                string_split(nullif(left(
+                    replace(replace(kw, chr(9), ' '), chr(10), ' '), 300), ''), ';'),
+                '{SOURCE_ID}',
+                CASE WHEN coalesce(code, '') NOT IN ('', 'unidentified')
+                         THEN 'oaire_' || funder_short || '_' || code
+                     ELSE 'oaire_' || left(coalesce(id, ''), 24)
+                END
+            FROM projects
+        """, [shard_paths, _WHITESPACE_RE])
+
+    return conn.execute(
         "SELECT COUNT(*) FROM grant_award WHERE source = ?", [SOURCE_ID]
     ).fetchone()[0]
-    return count
 
 
 def fetch_and_load(
     conn: duckdb.DuckDBPyConnection,
     tar_path: str | None = None,
 ) -> int:
-    """Extract OpenAIRE bulk data to CSV, then bulk-load into DuckDB.
+    """Load the OpenAIRE bulk dump into DuckDB straight from its JSONL shards.
 
     Returns total number of grants loaded.
     """
@@ -258,26 +166,17 @@ def fetch_and_load(
                     f.write(chunk)
         logger.info("Downloaded %.1f MB", os.path.getsize(tar_path) / 1e6)
 
-    # Extract to temporary CSV
-    csv_path = tar_path.replace(".tar", "_staging.csv")
-    logger.info("Extracting tar to staging CSV...")
+    # Copy the compressed shards to a scratch dir for DuckDB to scan
+    logger.info("Extracting JSONL shards from tar...")
     t0 = time.time()
-    num_extracted = _extract_to_csv(tar_path, csv_path)
-    t1 = time.time()
-    logger.info("Extraction: %d records in %.1f sec", num_extracted, t1 - t0)
-
-    # Bulk load into DuckDB
-    logger.info("Bulk loading CSV into DuckDB...")
-    t2 = time.time()
-    num_loaded = load_csv_to_db(conn, csv_path)
-    t3 = time.time()
-    logger.info("Bulk load: %d records in %.1f sec", num_loaded, t3 - t2)
-
-    # Clean up staging file
-    try:
-        os.remove(csv_path)
-    except OSError:
-        pass
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(tar_path) or None) as scratch:
+        shard_paths = _extract_shards(tar_path, scratch)
+        t1 = time.time()
+        logger.info("Extraction: %d shards in %.1f sec", len(shard_paths), t1 - t0)
+
+        logger.info("Bulk loading shards into DuckDB...")
+        num_loaded = load_shards_to_db(conn, shard_paths)
+        logger.info("Bulk load: %d records in %.1f sec", num_loaded, time.time() - t1)
 
     update_data_source(conn, SOURCE_ID, "OpenAIRE Bulk (Zenodo)", num_loaded, status="ok")
     return num_loaded
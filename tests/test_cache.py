@@ -7,7 +7,7 @@ import time
 
 import pytest
 
-from fundingscape.cache import CacheEntry, CachedHttpClient
+from fundingscape.cache import MMAP_MIN_BODY, CacheEntry, CachedHttpClient
 
 
 @pytest.fixture
@@ -80,3 +80,338 @@ class TestCachedHttpClient:
         assert meta["status_code"] == 200
         assert meta["etag"] == '"etag1"'
         assert meta["last_modified"] == "Wed, 21 Oct 2025 07:28:00 GMT"
+
+
+class TestFetchDecoding:
+    def test_fetch_json(self, tmp_cache, httpx_mock):
+        httpx_mock.add_response(url="https://example.com/api", json={"results": [1, 2]})
+        assert tmp_cache.fetch_json("https://example.com/api") == {"results": [1, 2]}
+
+    def test_fetch_struct(self, tmp_cache, httpx_mock):
+        import msgspec
+
+        class Page(msgspec.Struct):
+            total: int
+
+        httpx_mock.add_response(
+            url="https://example.com/api", json={"total": 3, "results": [{"a": 1}]},
+        )
+        page = tmp_cache.fetch_struct("https://example.com/api", Page)
+        assert page == Page(total=3)
+        assert Page in tmp_cache._decoders
+
+
+class TestConnectionReuse:
+    def test_conditional_request_uses_cache(self, tmp_cache, httpx_mock):
+        url = "https://example.com/etag"
+        httpx_mock.add_response(url=url, content=b"v1", headers={"etag": '"e1"'})
+        httpx_mock.add_response(url=url, status_code=304)
+        tmp_cache.fetch(url)
+        entry = tmp_cache.fetch(url)
+        assert entry.was_cached
+        assert entry.body == b"v1"
+        assert httpx_mock.get_requests()[1].headers["If-None-Match"] == '"e1"'
+
+    def test_context_manager_closes_client(self, tmp_path):
+        with CachedHttpClient(cache_dir=str(tmp_path), delay=0.0) as client:
+            assert not client._client.is_closed
+        assert client._client.is_closed
+
+
+class TestFetchMany:
+    async def test_fetch_many_preserves_order(self, tmp_cache, httpx_mock):
+        urls = [f"https://example.com/page/{i}" for i in range(5)]
+        for i, url in enumerate(urls):
+            httpx_mock.add_response(url=url, content=f"page {i}".encode())
+        entries = await tmp_cache.fetch_many(urls, concurrency=3)
+        assert [e.body for e in entries] == [f"page {i}".encode() for i in range(5)]
+        assert tmp_cache._read_cache(urls[2]).body == b"page 2"
+
+    async def test_fetch_many_revalidates_cache(self, tmp_cache, httpx_mock):
+        url = "https://example.com/cached"
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"old",
+            fetched_at=time.time(), etag='"e1"',
+        ))
+        httpx_mock.add_response(url=url, status_code=304)
+        [entry] = await tmp_cache.fetch_many([url])
+        assert entry.was_cached
+        assert entry.body == b"old"
+
+    async def test_fetch_many_return_exceptions(self, tmp_cache, httpx_mock):
+        httpx_mock.add_response(url="https://example.com/ok", content=b"ok")
+        httpx_mock.add_response(url="https://example.com/missing", status_code=404)
+        ok, missing = await tmp_cache.fetch_many(
+            ["https://example.com/ok", "https://example.com/missing"],
+            return_exceptions=True,
+        )
+        assert ok.body == b"ok"
+        assert isinstance(missing, Exception)
+
+
+class TestCacheLayout:
+    def test_single_file_per_url(self, tmp_cache, tmp_path):
+        url = "https://example.com/single"
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"payload", fetched_at=1.0,
+        ))
+        files = list(tmp_path.iterdir())
+        assert files == [tmp_cache._cache_path(url)]
+        assert files[0].read_bytes().endswith(b"payload")
+
+    def test_reads_legacy_two_file_layout(self, tmp_cache):
+        url = "https://example.com/legacy"
+        tmp_cache._cache_path(url, ".data").write_bytes(b"old body")
+        tmp_cache._cache_path(url, ".meta.json").write_text(json.dumps({
+            "url": url, "status_code": 200, "headers": {},
+            "fetched_at": 1.0, "etag": '"old"', "last_modified": None,
+        }))
+        cached = tmp_cache._read_cache(url)
+        assert cached.body == b"old body"
+        assert cached.etag == '"old"'
+        assert tmp_cache._read_metadata(url)["etag"] == '"old"'
+
+    def test_corrupt_file_is_a_miss(self, tmp_cache):
+        url = "https://example.com/corrupt"
+        tmp_cache._cache_path(url).write_bytes(b"garbage-not-a-cache-file")
+        assert tmp_cache._read_cache(url) is None
+
+
+class TestMemoryCache:
+    def test_written_entry_served_from_memory(self, tmp_cache):
+        url = "https://example.com/hot"
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"hot", fetched_at=1.0,
+        ))
+        tmp_cache._cache_path(url).unlink()
+        cached = tmp_cache._lookup(url)
+        assert cached.body == b"hot"
+        assert cached.was_cached is True
+
+    def test_lru_evicts_oldest(self, tmp_path):
+        client = CachedHttpClient(cache_dir=str(tmp_path), delay=0.0, mem_cache_size=2)
+        for i in range(3):
+            url = f"https://example.com/{i}"
+            client._write_cache(url, CacheEntry(
+                url=url, status_code=200, headers={}, body=b"x", fetched_at=1.0,
+            ))
+        assert list(client._mem_cache) == [
+            "https://example.com/1", "https://example.com/2",
+        ]
+
+    def test_bounded_by_total_bytes(self, tmp_path):
+        client = CachedHttpClient(
+            cache_dir=str(tmp_path), delay=0.0, mem_cache_bytes=10,
+        )
+        for i, body in enumerate((b"aaaa", b"bbbb", b"cccc", b"x" * 11)):
+            url = f"https://example.com/{i}"
+            client._write_cache(url, CacheEntry(
+                url=url, status_code=200, headers={}, body=body, fetched_at=1.0,
+            ))
+        # The third body pushed the total past 10 bytes; the oversized fourth
+        # is never kept in memory
+        assert list(client._mem_cache) == [
+            "https://example.com/1", "https://example.com/2",
+        ]
+        assert client._mem_bytes == 8
+
+    def test_disabled(self, tmp_path):
+        client = CachedHttpClient(cache_dir=str(tmp_path), delay=0.0, mem_cache_size=0)
+        url = "https://example.com/cold"
+        client._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"x", fetched_at=1.0,
+        ))
+        assert not client._mem_cache
+
+
+class TestWriteBatching:
+    def _entry(self, url):
+        return CacheEntry(url=url, status_code=200, headers={}, body=b"b", fetched_at=1.0)
+
+    def test_writes_deferred_until_batch_full(self, tmp_path):
+        client = CachedHttpClient(cache_dir=str(tmp_path), delay=0.0, write_batch=3)
+        urls = [f"https://example.com/{i}" for i in range(3)]
+        for url in urls[:2]:
+            client._write_cache(url, self._entry(url))
+        assert not any(client._cache_path(u).exists() for u in urls)
+        client._write_cache(urls[2], self._entry(urls[2]))
+        assert all(client._cache_path(u).exists() for u in urls)
+
+    def test_close_flushes(self, tmp_path):
+        client = CachedHttpClient(cache_dir=str(tmp_path), delay=0.0, write_batch=10)
+        url = "https://example.com/pending"
+        client._write_cache(url, self._entry(url))
+        client.close()
+        assert client._read_cache(url).body == b"b"
+
+    def test_pending_entry_readable(self, tmp_path):
+        client = CachedHttpClient(
+            cache_dir=str(tmp_path), delay=0.0, write_batch=10, mem_cache_size=0,
+        )
+        url = "https://example.com/pending"
+        client._write_cache(url, self._entry(url))
+        assert client._read_cache(url).body == b"b"
+
+
+class TestMappedBodies:
+    def test_large_body_is_mapped(self, tmp_cache):
+        url = "https://example.com/large"
+        body = os.urandom(MMAP_MIN_BODY)  # incompressible, so stored raw
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=body, fetched_at=1.0,
+        ))
+        with tmp_cache._read_cache(url) as cached:
+            assert isinstance(cached.body, memoryview)
+            assert cached.body == body
+        assert cached._mmap is None
+
+    def test_small_body_is_bytes(self, tmp_cache):
+        url = "https://example.com/small"
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"tiny", fetched_at=1.0,
+        ))
+        assert isinstance(tmp_cache._read_cache(url).body, bytes)
+
+    def test_rewrite_keeps_mapped_view_valid(self, tmp_cache):
+        url = "https://example.com/rewrite"
+        old = os.urandom(2 * MMAP_MIN_BODY)
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=old, fetched_at=1.0,
+        ))
+        cached = tmp_cache._read_cache(url)
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"b", fetched_at=2.0,
+        ))
+        assert cached.body == old
+        cached.close()
+
+
+class TestCompression:
+    def test_compressible_body_roundtrip(self, tmp_cache):
+        url = "https://example.com/page.html"
+        body = b"<tr><td>quantum</td></tr>" * 1000
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=body, fetched_at=1.0,
+        ))
+        assert tmp_cache._cache_path(url).stat().st_size < len(body) // 4
+        assert tmp_cache._read_metadata(url)["encoding"] == "zstd"
+        assert tmp_cache._read_cache(url).body == body
+
+    def test_archive_content_type_stored_raw(self, tmp_cache):
+        url = "https://example.com/data.zip"
+        body = b"PK" * 10000  # compressible, but labelled as an archive
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={"content-type": "application/zip"},
+            body=body, fetched_at=1.0,
+        ))
+        assert "encoding" not in tmp_cache._read_metadata(url)
+        assert tmp_cache._read_cache(url).body == body
+
+    def test_incompressible_sample_skips_large_body(self, tmp_cache, monkeypatch):
+        from fundingscape import cache as cache_module
+
+        calls = []
+        real = cache_module._compress
+        monkeypatch.setattr(
+            cache_module, "_compress", lambda b: calls.append(len(b)) or real(b),
+        )
+        url = "https://example.com/unlabelled"
+        body = os.urandom(2 * cache_module._COMPRESS_SAMPLE)
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=body, fetched_at=1.0,
+        ))
+        assert calls == [cache_module._COMPRESS_SAMPLE]  # only the sample
+        assert "encoding" not in tmp_cache._read_metadata(url)
+
+    def test_small_body_stored_raw(self, tmp_cache):
+        url = "https://example.com/small.json"
+        tmp_cache._write_cache(url, CacheEntry(
+            url=url, status_code=200, headers={}, body=b"{}", fetched_at=1.0,
+        ))
+        assert "encoding" not in tmp_cache._read_metadata(url)
+
+
+class TestPreferHead:
+    @pytest.fixture
+    def head_cache(self, tmp_path):
+        return CachedHttpClient(cache_dir=str(tmp_path), delay=0.0, prefer_head=True)
+
+    def test_head_etag_match_skips_get(self, head_cache, httpx_mock):
+        url = "https://example.com/dump.zip"
+        httpx_mock.add_response(url=url, method="GET", content=b"v1",
+                                headers={"etag": '"e1"'})
+        httpx_mock.add_response(url=url, method="HEAD", headers={"etag": '"e1"'})
+        head_cache.fetch(url)
+        entry = head_cache.fetch(url)
+        assert entry.was_cached
+        assert [r.method for r in httpx_mock.get_requests()] == ["GET", "HEAD"]
+
+    def test_changed_etag_falls_back_to_get(self, head_cache, httpx_mock):
+        url = "https://example.com/dump.zip"
+        httpx_mock.add_response(url=url, method="GET", content=b"v1",
+                                headers={"etag": '"e1"'})
+        httpx_mock.add_response(url=url, method="HEAD", headers={"etag": '"e2"'})
+        httpx_mock.add_response(url=url, method="GET", content=b"v2",
+                                headers={"etag": '"e2"'})
+        head_cache.fetch(url)
+        entry = head_cache.fetch(url)
+        assert entry.body == b"v2"
+        assert not entry.was_cached
+
+    async def test_fetch_many_uses_head(self, head_cache, httpx_mock):
+        url = "https://example.com/a"
+        httpx_mock.add_response(url=url, method="GET", content=b"v1",
+                                headers={"etag": '"e1"'})
+        httpx_mock.add_response(url=url, method="HEAD", status_code=304)
+        head_cache.fetch(url)
+        [entry] = await head_cache.fetch_many([url])
+        assert entry.was_cached
+
+
+class TestStreamedBody:
+    def test_large_body_and_buffer_reuse(self, tmp_cache, httpx_mock):
+        from fundingscape.cache import _BUF_KEEP_MAX
+
+        medium = os.urandom(3 * (1 << 20) + 17)
+        big = os.urandom(_BUF_KEEP_MAX + 17)
+        httpx_mock.add_response(url="https://example.com/medium", content=medium)
+        httpx_mock.add_response(url="https://example.com/big", content=big)
+        httpx_mock.add_response(url="https://example.com/small", content=b"small")
+        assert tmp_cache.fetch("https://example.com/medium").body == medium
+        capacity = len(tmp_cache._buf)
+        assert tmp_cache.fetch("https://example.com/small").body == b"small"
+        assert len(tmp_cache._buf) == capacity
+        # Announced bulk bodies bypass the buffer instead of growing it
+        assert tmp_cache.fetch("https://example.com/big").body == big
+        assert len(tmp_cache._buf) == capacity <= _BUF_KEEP_MAX
+
+    def test_unannounced_large_body_releases_buffer(self, tmp_cache, httpx_mock):
+        from pytest_httpx import IteratorStream
+
+        from fundingscape.cache import _BUF_KEEP_MAX, _BUF_SIZE
+
+        big = os.urandom(_BUF_KEEP_MAX + 17)
+        httpx_mock.add_response(
+            url="https://example.com/big",
+            stream=IteratorStream([big[:_BUF_SIZE], big[_BUF_SIZE:]]),
+        )
+        assert tmp_cache.fetch("https://example.com/big").body == big
+        assert len(tmp_cache._buf) == _BUF_SIZE
+
+    def test_only_relevant_headers_kept(self, tmp_cache, httpx_mock):
+        url = "https://example.com/api"
+        httpx_mock.add_response(url=url, content=b"{}", headers={
+            "Content-Type": "application/json", "ETag": '"e1"',
+            "Access-Control-Allow-Origin": "*", "Set-Cookie": "s=1",
+        })
+        entry = tmp_cache.fetch(url)
+        assert set(entry.headers) <= {"content-type", "etag", "content-length"}
+        assert entry.headers["content-type"] == "application/json"
+        assert tmp_cache._read_metadata(url)["headers"] == entry.headers
+
+    def test_error_status_raises(self, tmp_cache, httpx_mock):
+        import httpx
+
+        httpx_mock.add_response(url="https://example.com/missing", status_code=404)
+        with pytest.raises(httpx.HTTPStatusError):
+            tmp_cache.fetch("https://example.com/missing")
@@ -1,15 +1,23 @@
 """Tests for the database layer."""
 
+import json
 from datetime import date
 from decimal import Decimal
 
+import pytest
+
 from fundingscape.db import (
+    bulk_load,
+    bulk_upsert_calls,
+    bulk_upsert_grants,
     create_tables,
     insert_call,
     insert_funder,
     insert_grant,
+    insert_grants_many,
     upsert_call,
     upsert_grant,
+    transaction,
     update_data_source,
     _seed_funders,
     _seed_profiles,
@@ -39,6 +47,38 @@ class TestSchema:
         ).fetchall()
         assert len(tables) >= 7
 
+    def test_get_connection_skips_current_schema(self, tmp_path, monkeypatch):
+        import fundingscape.db as db_mod
+
+        path = str(tmp_path / "fs.duckdb")
+        db_mod.get_connection(path).close()
+        calls = []
+        monkeypatch.setattr(db_mod, "create_tables", calls.append)
+        conn = db_mod.get_connection(path)
+        assert calls == []
+        assert db_mod._schema_version(conn) == db_mod.SCHEMA_VERSION
+        conn.close()
+
+    def test_get_connection_resource_env(self, tmp_path, monkeypatch):
+        import fundingscape.db as db_mod
+
+        spill = tmp_path / "spill"
+        monkeypatch.setenv("FUNDINGSCAPE_MEMORY_LIMIT", "1GB")
+        monkeypatch.setenv("FUNDINGSCAPE_TEMP_DIR", str(spill))
+        monkeypatch.setenv("FUNDINGSCAPE_THREADS", "2")
+        conn = db_mod.get_connection(str(tmp_path / "fs.duckdb"))
+        assert conn.execute("SELECT current_setting('threads')").fetchone()[0] == 2
+        assert conn.execute(
+            "SELECT current_setting('temp_directory')"
+        ).fetchone()[0] == str(spill)
+        conn.close()
+
+    def test_upsert_key_indexes(self, db):
+        indexes = {r[0] for r in db.execute(
+            "SELECT index_name FROM duckdb_indexes()"
+        ).fetchall()}
+        assert {"idx_grant_source_id", "idx_call_source_id"} <= indexes
+
 
 class TestFunderCrud:
     def test_insert_funder(self, db):
@@ -98,6 +138,28 @@ class TestCallCrud:
         assert row[0] == "Updated"
         assert row[1] == "closed"
 
+    def test_bulk_upsert_calls(self, db):
+        existing = upsert_call(db, Call(
+            title="Old", status="open", source="test", source_id="c1",
+        ))
+        n = bulk_upsert_calls(db, [
+            Call(title="New", status="closed", source="test", source_id="c1",
+                 deadline=date(2025, 9, 15), topic_keywords=["quantum"]),
+            Call(title="Fresh", status="open", source="test", source_id="c2",
+                 raw_data={"ccm2Id": 7}),
+            Call(title="No key A", status="open", source="test"),
+            Call(title="No key B", status="open", source="test"),
+        ])
+        assert n == 4
+        rows = db.execute(
+            "SELECT id, title, status, deadline, topic_keywords, raw_data->>'ccm2Id' "
+            "FROM call ORDER BY title"
+        ).fetchall()
+        assert [r[1] for r in rows] == ["Fresh", "New", "No key A", "No key B"]
+        assert rows[1] == (existing, "New", "closed", date(2025, 9, 15), ["quantum"], None)
+        assert rows[0][5] == "7"
+        assert bulk_upsert_calls(db, []) == 0
+
 
 class TestGrantCrud:
     def test_insert_grant(self, db):
@@ -122,6 +184,16 @@ class TestGrantCrud:
         assert row[1] == "Jane Doe"
         assert row[2] == 1500000.0
 
+    def test_partners_json_roundtrip(self, db):
+        partners = [{"name": "Uni A", "country": "DE"}, {"name": "Lab B", "ids": [1, "x"]}]
+        gid = insert_grant(db, GrantAward(
+            project_title="P", source="test", source_id="p1", partners=partners,
+        ))
+        stored = db.execute(
+            "SELECT partners FROM grant_award WHERE id = ?", [gid]
+        ).fetchone()[0]
+        assert json.loads(stored) == partners
+
     def test_upsert_grant_insert(self, db):
         g = GrantAward(project_title="New Grant", source="test", source_id="g1")
         gid = upsert_grant(db, g)
@@ -151,6 +223,70 @@ class TestGrantCrud:
         assert row[0] == "Updated Grant"
         assert row[1] == "completed"
 
+    def test_insert_grants_many(self, db):
+        grants = [
+            GrantAward(project_title=f"Bulk {i}", source="test", source_id=f"b{i}",
+                       partners=[{"name": "Uni"}] if i == 0 else [])
+            for i in range(3)
+        ]
+        ids = insert_grants_many(db, grants)
+        assert len(set(ids)) == 3
+        rows = db.execute(
+            "SELECT id, project_title FROM grant_award WHERE source = 'test' ORDER BY id"
+        ).fetchall()
+        assert rows == [(gid, f"Bulk {i}") for i, gid in enumerate(ids)]
+        assert insert_grants_many(db, []) == []
+
+    def test_bulk_upsert_grants(self, db):
+        existing = upsert_grant(db, GrantAward(
+            project_title="Old", source="test", source_id="u1", status="active",
+        ))
+        n = bulk_upsert_grants(db, [
+            GrantAward(project_title="Stale", source="test", source_id="u1"),
+            GrantAward(project_title="New", source="test", source_id="u1",
+                       status="completed", topic_keywords=["quantum"],
+                       start_date=date(2024, 1, 1), total_funding=Decimal("10")),
+            GrantAward(project_title="Fresh", source="test", source_id="u2",
+                       partners=[{"name": "Uni"}]),
+        ])
+        assert n == 2
+        rows = db.execute(
+            "SELECT id, source_id, project_title, status, topic_keywords, start_date, "
+            "total_funding FROM grant_award WHERE source = 'test' ORDER BY source_id"
+        ).fetchall()
+        assert len(rows) == 2
+        assert rows[0] == (existing, "u1", "New", "completed", ["quantum"],
+                           date(2024, 1, 1), 10.0)
+        assert rows[1][2] == "Fresh"
+        assert bulk_upsert_grants(db, []) == 0
+
+
+class TestTransactions:
+    def test_rollback_on_error(self, db):
+        with pytest.raises(RuntimeError):
+            with transaction(db):
+                insert_grant(db, GrantAward(project_title="T", source="test", source_id="t1"))
+                raise RuntimeError("boom")
+        assert db.execute("SELECT COUNT(*) FROM grant_award").fetchone()[0] == 0
+
+    def test_nested_joins_outer(self, db):
+        with transaction(db):
+            with transaction(db):
+                insert_grant(db, GrantAward(project_title="T", source="test", source_id="t1"))
+            bulk_upsert_grants(db, [GrantAward(project_title="U", source="test", source_id="t2")])
+        assert db.execute("SELECT COUNT(*) FROM grant_award").fetchone()[0] == 2
+
+    def test_bulk_load_restores_setting(self, db):
+        with bulk_load(db):
+            assert db.execute(
+                "SELECT current_setting('preserve_insertion_order')"
+            ).fetchone()[0] is False
+            insert_grant(db, GrantAward(project_title="T", source="test", source_id="t1"))
+        assert db.execute(
+            "SELECT current_setting('preserve_insertion_order')"
+        ).fetchone()[0] is True
+        assert db.execute("SELECT COUNT(*) FROM grant_award").fetchone()[0] == 1
+
 
 class TestDataSource:
     def test_update_data_source(self, db):
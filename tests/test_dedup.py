@@ -439,6 +439,13 @@ class TestEnrichCordisFromOpenaire:
         assert row[0] == 1000000.0  # NOT overwritten
         assert row[1] == "DE"  # NOT overwritten
 
+    def test_skips_rows_openaire_cannot_fill(self, db):
+        """A gap OpenAIRE has no value for is not counted or touched."""
+        _cordis_grant(db, "100003", total_funding=None, pi_country="DE")
+        _openaire_bulk_grant(db, "100003", total_funding=None, pi_country="FR")
+
+        assert _enrich_cordis_from_openaire(db) == 0
+
 
 class TestFlagOpenAIREECDuplicates:
     def test_flags_bulk_ec_duplicate(self, db):
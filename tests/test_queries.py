@@ -8,7 +8,9 @@ import pytest
 from fundingscape.db import create_tables, insert_call, upsert_grant
 from fundingscape.models import Call, GrantAward
 from fundingscape.queries import (
+    field_rollups,
     funding_landscape_summary,
+    gap_analysis,
     historical_trends,
     income_projection,
     open_calls_by_deadline,
@@ -121,6 +123,13 @@ class TestOpenCalls:
         calls = open_calls_by_deadline(loaded_db, months_ahead=6, quantum_only=False)
         assert len(calls) == 3
 
+    def test_limit(self, loaded_db):
+        calls = open_calls_by_deadline(
+            loaded_db, months_ahead=6, quantum_only=False, limit=2,
+        )
+        # Soonest deadlines first: AGRI (30d), then ERC (60d)
+        assert [c["identifier"] for c in calls] == ["AGRI-2025", "ERC-2025-STG"]
+
 
 class TestFundingLandscape:
     def test_summary(self, loaded_db):
@@ -148,6 +157,11 @@ class TestTopPIs:
         assert pis[0]["institution"] == "LEIBNIZ UNIVERSITAT HANNOVER"
         assert pis[0]["num_grants"] == 2
 
+    def test_matches_keyword_substring(self, loaded_db):
+        # "machine" appears only inside the keyword "machine_learning"
+        pis = top_pis_by_field(loaded_db, "machine", limit=10)
+        assert [p["institution"] for p in pis] == ["TU BERLIN"]
+
 
 class TestHistoricalTrends:
     def test_quantum_trends(self, loaded_db):
@@ -155,3 +169,40 @@ class TestHistoricalTrends:
         assert len(trends) > 0
         years = [t["year"] for t in trends]
         assert 2024 in years
+
+
+class TestFieldRollups:
+    def test_matches_standalone_queries(self, loaded_db):
+        trends, pis = field_rollups(loaded_db, "quantum", limit=10)
+        assert trends == historical_trends(loaded_db, "quantum")
+        expected = top_pis_by_field(loaded_db, "quantum", limit=10)
+        for p in pis + expected:
+            p["projects"] = sorted(p["projects"])  # ARRAY_AGG order is unspecified
+        assert pis == expected
+
+    def test_limit_applies_to_institutions_only(self, loaded_db):
+        for i, (inst, funding) in enumerate(
+            [("TU MUNICH", "5000000"), (None, "9000000"), ("UNFUNDED LAB", None)]
+        ):
+            upsert_grant(loaded_db, GrantAward(
+                project_title="Quantum Sensing",
+                pi_institution=inst,
+                start_date=date(2022, 1, 1),
+                total_funding=Decimal(funding) if funding else None,
+                source="cordis_bulk",
+                source_id=f"extra_{i}",
+            ))
+        trends, pis = field_rollups(loaded_db, "quantum", limit=2)
+        assert trends == historical_trends(loaded_db, "quantum")
+        assert [p["institution"] for p in pis] == [
+            "TU MUNICH",
+            "LEIBNIZ UNIVERSITAT HANNOVER",
+        ]
+
+
+class TestGapAnalysis:
+    def test_programmes_with_open_calls(self, loaded_db):
+        gaps = {g["programme"]: g for g in gap_analysis(loaded_db, "%HANNOVER%")}
+        assert set(gaps) == {"HORIZON", "AGRIP"}
+        assert gaps["HORIZON"]["open_calls"] == 2
+        assert gaps["HORIZON"]["status"] == "Never applied"
@@ -0,0 +1,58 @@
+"""Tests for report generation."""
+
+import duckdb
+import pytest
+
+from fundingscape.db import upsert_grant
+from fundingscape.models import GrantAward
+from fundingscape.report import generate_report
+
+
+class TestGenerateReport:
+    def test_deduped_snapshot_is_dropped(self, db):
+        for i in (1, 2, 3):
+            upsert_grant(db, GrantAward(
+                project_title=f"Quantum Project {i}",
+                pi_institution="LEIBNIZ UNIVERSITAT HANNOVER",
+                status="active",
+                source="cordis_bulk",
+                source_id=f"rep_{i}",
+            ))
+        db.execute("UPDATE grant_award SET dedup_of = 1 WHERE source_id = 'rep_2'")
+        db.execute("UPDATE grant_award SET is_aggregate = TRUE WHERE source_id = 'rep_3'")
+
+        report = generate_report(db)
+
+        assert "| Unique grants (deduplicated) | 1 |" in report
+        assert "| Quantum-related grants | 1 |" in report
+        assert "| Duplicate grants flagged | 1 |" in report
+        assert "| Active LUH grants (Horizon) | 1 |" in report
+        # Data quality counts everything outside the deduplicated view
+        assert "- **Duplicate grants flagged**: 2" in report
+        # Only the view remains once the report is done
+        tables = db.execute(
+            "SELECT table_schema FROM information_schema.tables "
+            "WHERE table_name = 'grant_award_deduped'"
+        ).fetchall()
+        assert tables == [("main",)]
+
+    def test_default_connection_is_read_only(self, tmp_path, monkeypatch):
+        import fundingscape.report as report_mod
+        from fundingscape.db import get_connection
+
+        path = str(tmp_path / "fs.duckdb")
+        get_connection(path).close()
+        opened = []
+
+        def spy(**kwargs):
+            assert kwargs == {"read_only": True}
+            opened.append(get_connection(path, **kwargs))
+            return opened[-1]
+
+        monkeypatch.setattr(report_mod, "get_connection", spy)
+
+        report = generate_report()
+
+        assert "| Total grants in database | 0 |" in report
+        with pytest.raises(duckdb.ConnectionException):
+            opened[0].execute("SELECT 1")  # closed after the report
@@ -120,3 +120,29 @@ class TestDatabaseLoading:
             "SELECT project_title FROM grant_award WHERE source_id = 'horizon_101234567'"
         ).fetchone()
         assert "Topological" in qt[0]
+
+    def test_fetch_and_load(self, db, tmp_path, httpx_mock):
+        """End to end: zip download, parse, enrich and bulk load."""
+        from fundingscape.cache import CachedHttpClient
+        from fundingscape.sources.cordis import CORDIS_URLS, fetch_and_load
+
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("project.csv", SAMPLE_PROJECT_CSV)
+            zf.writestr("organization.csv", SAMPLE_ORG_CSV)
+        httpx_mock.add_response(
+            url=CORDIS_URLS["horizon"], content=buf.getvalue(), headers={"etag": '"v1"'},
+        )
+        httpx_mock.add_response(url=CORDIS_URLS["horizon"], status_code=304)
+        client = CachedHttpClient(cache_dir=str(tmp_path), delay=0.0)
+
+        assert fetch_and_load(db, client, frameworks=["horizon"]) == 3
+        # Reloading updates in place instead of duplicating
+        assert fetch_and_load(db, client, frameworks=["horizon"]) == 3
+
+        rows = db.execute(
+            "SELECT source_id, pi_institution FROM grant_award ORDER BY source_id"
+        ).fetchall()
+        assert len(rows) == 3
+        assert rows[0] == ("horizon_101234567", "LEIBNIZ UNIVERSITAET HANNOVER")
+
@@ -153,3 +153,15 @@ class TestDatabaseLoading:
         # AGRIP should be filtered out
         assert len(filtered) == 2
         assert all(c.framework_programme == "HORIZON" for c in filtered)
+
+    def test_parse_calls_filters_programmes(self):
+        filtered = parse_calls(SAMPLE_FT_DATA, {"HORIZON", "ERC"})
+        assert len(filtered) == 2
+        assert all(c.framework_programme == "HORIZON" for c in filtered)
+
+    def test_parse_calls_filter_skips_null_programme(self):
+        data = {"fundingData": {"GrantTenderObj": [
+            {"identifier": "NO-FP", "frameworkProgramme": {"abbreviation": None}},
+        ]}}
+        assert parse_calls(data, {"HORIZON"}) == []
+        assert parse_calls(data)[0].framework_programme is None
@@ -8,6 +8,8 @@ import pytest
 from fundingscape.sources.gepris import (
     _search_projects,
     _fetch_project_detail,
+    _fetch_project_details,
+    PROJECT_URL,
     SOURCE_ID,
     QUANTUM_KEYWORDS,
 )
@@ -216,6 +218,22 @@ class TestDetailPageParsing:
         grant = _fetch_project_detail(client, "12345678")
         assert grant is None
 
+    def test_fetch_many_details_skips_failures(self, tmp_path, httpx_mock):
+        from fundingscape.cache import CachedHttpClient
+
+        httpx_mock.add_response(
+            url=f"{PROJECT_URL}/12345678?language=en", text=SAMPLE_DETAIL_HTML,
+        )
+        httpx_mock.add_response(
+            url=f"{PROJECT_URL}/11111?language=en", status_code=500,
+        )
+        client = CachedHttpClient(cache_dir=str(tmp_path), delay=0.0)
+
+        grants = _fetch_project_details(client, ["12345678", "11111"])
+
+        assert [g.source_id for g in grants] == ["gepris_12345678"]
+        assert "Mustermann" in grants[0].pi_name
+
 
 class TestDatabaseLoading:
     def test_load_gepris_grant(self, db):
@@ -156,3 +156,34 @@ class TestDatabaseLoading:
         ).fetchone()
         assert "Distributed Quantum" in row[0]
         assert row[1] == 3049360.0
+
+
+class TestFetch:
+    def test_fetch_grants_pages_concurrently(self, httpx_mock):
+        import re
+
+        from fundingscape.sources.openaire import fetch_grants_for_funder
+
+        def page(results, total):
+            return {"response": {
+                "header": {"total": {"$": total}},
+                "results": {"result": results},
+            }}
+
+        httpx_mock.add_response(
+            url=re.compile(r".*keywords=quantum&.*page=1.*"),
+            json=page([SAMPLE_RESULT], 150),
+        )
+        httpx_mock.add_response(
+            url=re.compile(r".*keywords=quantum&.*page=2.*"),
+            json=page(SAMPLE_DFG_RESULT, 150),  # single results come unwrapped
+        )
+        httpx_mock.add_response(
+            url=re.compile(r".*keywords=qubit&.*page=1.*"), status_code=500,
+        )
+
+        grants = fetch_grants_for_funder(
+            "UKRI", keywords=["quantum", "qubit"], delay=0.0,
+        )
+
+        assert [g.project_id for g in grants] == ["EP/W032643/1", "239028562"]
@@ -1,10 +1,9 @@
 """Tests for OpenAIRE bulk data loader."""
 
+import gzip
 import json
 
-import pytest
-
-from fundingscape.sources.openaire_bulk import _parse_date
+from fundingscape.sources.openaire_bulk import load_shards_to_db
 
 
 SAMPLE_PROJECT_LINE = json.dumps({
@@ -41,27 +40,79 @@ SAMPLE_PROJECT_LINE = json.dumps({
 })
 
 
-class TestParseDate:
-    def test_valid(self):
-        assert _parse_date("2024-01-15") == "2024-01-15"
-
-    def test_none(self):
-        assert _parse_date(None) is None
-
-    def test_empty(self):
-        assert _parse_date("") is None
-
-    def test_invalid(self):
-        assert _parse_date("not-a-date") is None
+class TestDateDerivation:
+    def test_start_dates(self, db, tmp_path):
+        starts = {
+            "valid": "2024-01-15",
+            "none": None,
+            "empty": "",
+            "invalid": "not-a-date",
+            "timestamp": "2024-01-15T10:00:00",
+        }
+        lines = [
+            json.dumps({"id": f"x::{code}", "code": code, "title": "Project",
+                        "startDate": start})
+            for code, start in starts.items()
+        ]
+        shard = tmp_path / "part-0.json.gz"
+        shard.write_bytes(gzip.compress("\n".join(lines).encode()))
 
-    def test_truncates_time(self):
-        assert _parse_date("2024-01-15T10:00:00") == "2024-01-15"
+        assert load_shards_to_db(db, [str(shard)]) == len(starts)
+        rows = dict(db.execute(
+            "SELECT project_id, CAST(start_date AS VARCHAR) FROM grant_award"
+        ).fetchall())
+        assert rows == {
+            "valid": "2024-01-15",
+            "none": None,
+            "empty": None,
+            "invalid": None,
+            "timestamp": "2024-01-15",
+        }
 
 
-class TestCSVExtraction:
+class TestSampleProject:
     def test_sample_project_parseable(self):
         """Verify the sample project JSON is valid."""
         proj = json.loads(SAMPLE_PROJECT_LINE)
         assert proj["title"] == "ParityQC: Parity Constraints as a Quantum Computing Toolbox"
         assert proj["fundings"][0]["shortName"] == "FWF"
         assert proj["granted"]["fundedAmount"] == 1168240.0
+
+
+class TestBulkLoad:
+    def test_fetch_and_load_from_tar(self, db, tmp_path):
+        import io
+        import tarfile
+
+        from fundingscape.sources.openaire_bulk import fetch_and_load
+
+        lines = [
+            SAMPLE_PROJECT_LINE,
+            json.dumps({"id": "x::1", "code": "2", "title": "unidentified"}),
+            "{not json",
+        ]
+        shard = gzip.compress("\n".join(lines).encode())
+        tar_path = tmp_path / "project.tar"
+        with tarfile.open(tar_path, "w") as tar:
+            info = tarfile.TarInfo("project/part-0.json.gz")
+            info.size = len(shard)
+            tar.addfile(info, io.BytesIO(shard))
+
+        assert fetch_and_load(db, str(tar_path)) == 1
+        # Reloading replaces the previous bulk rows
+        assert fetch_and_load(db, str(tar_path)) == 1
+
+        row = db.execute("""
+            SELECT source_id, project_id, acronym, pi_country, start_date,
+                   total_funding, currency, status, topic_keywords, abstract
+            FROM grant_award WHERE source = 'openaire_bulk'
+        """).fetchone()
+        assert row[0] == "oaire_FWF_Y 1067"
+        assert row[1:4] == ("Y 1067", "ParityQC", "AT")
+        assert str(row[4]) == "2017-09-04"
+        assert row[5:8] == (1168240.0, "EUR", "completed")
+        assert row[8] == [
+            "FWF", "Quantum Computing", " Quantum Simulation", " Many-body Physics",
+        ]
+        assert row[9] == "A project about parity quantum computing..."
+        assert list(tmp_path.iterdir()) == [tar_path]  # scratch dir removed